@@ -8,6 +8,16 @@ ROSTER_SLOTS = ("PG", "SG", "SF", "PF", "C", "G", "F", "UTIL")
 ENTRY_HEADER_COLS = ("Entry ID", "Contest Name", "Contest ID", "Entry Fee")
 
 
+# --- INPUT COLUMNS ---
+# Only these columns are read from the DKEntries player pool and the
+# projections CSV; everything else in those files is ignored at parse time.
+PLAYER_POOL_COLS = (
+    "Position", "Name + ID", "Name", "ID", "Roster Position",
+    "Salary", "Game Info", "TeamAbbrev", "AvgPointsPerGame",
+)
+PROJECTION_COLS = ("ID", "Projection", "Own_Proj", "Team", "Opponent")
+
+
 # --- EXPORT PREFIXES ---
 STANDARD_EXPORT_PREFIX = "upload-ready-DKEntries"
 LATE_SWAP_PREFIX = "late-swap-entries"
@@ -29,6 +39,12 @@ class Config:
     min_games: int = 2
     min_projection: float = 10.0
 
+    # --- SOLVER SETTINGS ---
+    # Opt-in exact slot/salary DP ahead of the HiGHS MILP in the engine. It
+    # keeps a per-worker choice table of about n_players * 256 * (cap / 100)
+    # bytes (~32 MB for 250 players), capped in engine.py.
+    lineup_dp: bool = False
+
     # --- DIRECTORY SETTINGS ---
     entries_path: str = "DKEntries.csv"
     projs_dir: str = "projections"
@@ -1,19 +1,40 @@
 import argparse
 import concurrent.futures
 import itertools
+import math
 import multiprocessing
 import os
 import time
 import traceback
 from datetime import datetime
-from typing import List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
+import highspy
 import numpy as np
 import pandas as pd
-import pulp
 
 from .config import Config, ROSTER_SLOTS
-from .utils import get_latest_file, merge_player_pool, parse_dk_entries
+from .utils import (
+    assign_slots,
+    get_latest_file,
+    load_projections,
+    merge_player_pool,
+    parse_dk_entries,
+    slot_eligibility_matrix,
+)
+
+
+# Base positions accepted by each non-UTIL slot; UTIL accepts everyone.
+_SLOT_BASE_POSITIONS = {
+    "PG": {"PG"}, "SG": {"SG"}, "SF": {"SF"}, "PF": {"PF"}, "C": {"C"},
+    "G": {"PG", "SG"}, "F": {"SF", "PF"},
+}
+# Largest salary grid (cap / salary unit) the DP selector is used for; DK
+# salaries are multiples of 100, so a 50000 cap gives 500 states.
+_DP_MAX_SALARY_STATES = 2000
+# Largest DP workspace (see dp_workspace_bytes) a worker may allocate; bigger
+# pools go straight to HiGHS.
+_DP_MAX_WORKSPACE_BYTES = 64 * 2**20
 
 
 # --- DATA LOADING ---
@@ -21,193 +42,494 @@ from .utils import get_latest_file, merge_player_pool, parse_dk_entries
 
 def load_data(projs_file: str, entries_file: str) -> pd.DataFrame:
     df_players = parse_dk_entries(entries_file)
-    df_projs = pd.read_csv(projs_file)
+    df_projs = load_projections(projs_file)
     # derive_time_game=True adds StartTime and Game via the simple pre-lock split.
     # late_swapper.load_data instead calls _attach_game_column (derive_game_key)
     # to recover started games whose Game Info has become "In Progress".
-    return merge_player_pool(df_players, df_projs, how="inner", derive_time_game=True)
+    df = merge_player_pool(df_players, df_projs, how="inner", derive_time_game=True)
 
+    # Low-cardinality labels as categoricals: smaller to pickle out to every
+    # worker, and eligibility/game grouping work on integer codes.
+    for col in ("Roster Position", "Game", "TeamAbbrev", "Name"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    df["Salary"] = df["Salary"].astype("int32")
+    return df
 
-# --- WORKER FUNCTION (MUST BE TOP-LEVEL) ---
-def generate_single_lineup(
-    df: pd.DataFrame, randomness: float, min_salary: int, salary_cap: int, roster_size: int, min_games: int
-) -> Tuple[List[str], Set[int]]:
-    try:
-        np.random.seed()
-        prob = pulp.LpProblem("NBA_DFS_Worker", pulp.LpMaximize)
 
-        # Convert necessary columns to native Python dicts for instant lookup in loops
-        salary_dict = df["Salary"].to_dict()
-        pos_dict = df["Roster Position"].to_dict()
+def game_index_map(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Map each known game to the positional indices of its players.
 
-        if randomness > 0:
-            std_dev = df["Projection"] * randomness
-            sim_proj = pd.Series(
-                np.random.normal(df["Projection"], std_dev), index=df.index
-            )
-        else:
-            sim_proj = df["Projection"].to_dict()
+    Players with a missing or empty game key are left out, so they never
+    count toward the min-games floor.
+    """
+    return {
+        g: positions
+        for g, positions in df.groupby("Game", sort=False, observed=True).indices.items()
+        if pd.notna(g) and g != ""
+    }
 
-        player_vars = pulp.LpVariable.dicts("player", df.index, cat=pulp.LpBinary)
 
-        # Objective
-        prob += pulp.lpSum([sim_proj[i] * player_vars[i] for i in df.index])
+def dp_workspace(n_players: int, n_slots: int, cap_units: int) -> Tuple[np.ndarray, ...]:
+    """Scratch arrays for ``select_lineup_dp``, allocated once per pool.
 
-        # Constraints (Using salary_dict instead of df.loc)
-        prob += (
-            pulp.lpSum([salary_dict[i] * player_vars[i] for i in df.index])
-            <= salary_cap
-        )
-        prob += (
-            pulp.lpSum([salary_dict[i] * player_vars[i] for i in df.index])
-            >= min_salary
-        )
-        prob += pulp.lpSum([player_vars[i] for i in df.index]) == roster_size
+    Returns the state table, one candidate buffer per slot, a comparison
+    mask, and the per-player choice table. Every solve overwrites them in
+    place, so a worker reuses the same memory for all of its lineups.
+    """
+    shape = (2,) * n_slots + (cap_units + 1,)
+    half = 2 ** (n_slots - 1) * (cap_units + 1)
+    return (
+        np.empty(shape, dtype=np.float32),
+        np.empty((n_slots, half), dtype=np.float32),
+        np.empty(half, dtype=bool),
+        np.empty((n_players,) + shape, dtype=np.int8),
+    )
 
-        # Positional
-        slots = ROSTER_SLOTS
-        slot_vars = pulp.LpVariable.dicts("slot", (df.index, slots), cat=pulp.LpBinary)
 
-        for i in df.index:
-            prob += pulp.lpSum([slot_vars[i][s] for s in slots]) == player_vars[i]
-            pos_str = str(pos_dict[i])  # Using pos_dict instead of df.loc
+def dp_workspace_bytes(n_players: int, n_slots: int, cap_units: int) -> int:
+    """Bytes ``dp_workspace`` allocates, dominated by the int8 choice table."""
+    states = 2**n_slots * (cap_units + 1)
+    return states * (n_players + 4) + states // 2 * (4 * n_slots + 1)
 
-            for s in slots:
-                eligible = False
-                if s == "UTIL":
-                    eligible = True
-                elif s == "G":
-                    eligible = "PG" in pos_str or "SG" in pos_str
-                elif s == "F":
-                    eligible = "SF" in pos_str or "PF" in pos_str
-                else:
-                    eligible = s in pos_str
 
-                if not eligible:
-                    prob += slot_vars[i][s] == 0
+def select_lineup_dp(
+    proj: np.ndarray, salary_units: np.ndarray, eligible: np.ndarray, min_units: int, cap_units: int,
+    workspace: Optional[Tuple[np.ndarray, ...]] = None,
+) -> Optional[List[int]]:
+    """Pick the max-projection roster that fills every slot, by exact DP.
 
-        for s in slots:
-            prob += pulp.lpSum([slot_vars[i][s] for i in df.index]) == 1
+    The state is (filled-slot mask, salary spent in units), stored as an
+    array with one length-2 axis per slot so that "slot s empty" and "slot s
+    filled" are plain views. Each player extends every state through each
+    slot it is eligible for. Salary is the only other constraint, so the
+    min-games rule is left to the caller.
 
-        # Min Games
-        # The 'Game' column is now pre-processed in load_data.
-        # game_vars[g] is an indicator for "game g is represented in the lineup".
-        # The <= link forces the indicator to 0 unless at least one of that
-        # game's players is selected, so requiring the indicators to sum to
-        # >= min_games is a genuine "span at least min_games distinct games"
-        # constraint. A one-directional >= link would leave the indicators free
-        # to switch on for empty games, making the floor non-binding.
-        games = [g for g in df["Game"].unique() if pd.notna(g) and g != ""]
-        game_vars = pulp.LpVariable.dicts("game", games, cat=pulp.LpBinary)
-
-        # Use pandas groupby to create a dictionary of {game: [list_of_indices]}
-        # This completely avoids doing df[df['Game'] == game] inside the loop
-        game_to_players = df.groupby("Game").groups
-
-        for game in games:
-            players_in_game = game_to_players[game]
-            prob += game_vars[game] <= pulp.lpSum(
-                [player_vars[i] for i in players_in_game]
-            )
+    ``workspace`` is the buffer tuple from ``dp_workspace``; it is allocated
+    here when not given.
+
+    Returns:
+        Row positions of the chosen players, or None if no roster fits the
+        salary band.
+    """
+    n_slots = eligible.shape[1]
+    if workspace is None:
+        workspace = dp_workspace(len(proj), n_slots, cap_units)
+    # float32 halves the memory traffic of the per-player updates; the
+    # caller reports the lineup, not this objective.
+    dp, cand, better, choice = workspace
+    dp.fill(-np.inf)
+    dp[(0,) * (n_slots + 1)] = 0.0
+    # choice[k][state] = 1 + the slot player k filled to reach state, or 0.
+    lead = [(slice(None),) * s for s in range(n_slots)]
+
+    for k, w in enumerate(salary_units.tolist()):
+        choice[k].fill(0)
+        if w > cap_units:
+            continue
+        p = np.float32(proj[k])
+        # Contiguous views over the flat scratch rows, one per slot's
+        # shifted half-table.
+        view = (2,) * (n_slots - 1) + (cap_units + 1 - w,)
+        size = math.prod(view)
+        improved = better[:size].reshape(view)
+        slots = np.flatnonzero(eligible[k]).tolist()
+        # Build every candidate before writing any, so one player fills at
+        # most one slot.
+        for j, s in enumerate(slots):
+            np.add(dp[lead[s] + (0, Ellipsis, slice(0, view[-1]))], p, out=cand[j, :size].reshape(view))
+        for j, s in enumerate(slots):
+            src = cand[j, :size].reshape(view)
+            dst = dp[lead[s] + (1, Ellipsis, slice(w, None))]
+            np.greater(src, dst, out=improved)
+            np.copyto(dst, src, where=improved)
+            np.copyto(choice[(k,) + lead[s] + (1, Ellipsis, slice(w, None))], s + 1, where=improved)
+
+    totals = dp[(1,) * n_slots][min_units:]
+    if totals.size == 0 or not np.isfinite(totals.max()):
+        return None
+
+    mask = [1] * n_slots
+    spent = min_units + int(totals.argmax())
+    picks = []
+    for k in range(len(proj) - 1, -1, -1):
+        slot = int(choice[(k,) + tuple(mask) + (spent,)])
+        if slot:
+            picks.append(k)
+            mask[slot - 1] = 0
+            spent -= int(salary_units[k])
+    return picks[::-1]
+
+
+class LineupSolver:
+    """Reusable lineup MILP for one player pool.
+
+    The salary, roster-size, positional, and min-games constraints depend only
+    on the pool, so they are passed to a ``highspy.Highs`` instance once in
+    ``__init__`` as CSR arrays. Each ``solve`` call only swaps in a freshly
+    perturbed objective with ``changeColsCost``, so a worker generating many
+    lineups builds the model once and never goes through a modelling layer.
+
+    With ``use_dp`` (``Config.lineup_dp``) an 8-slot roster is first picked
+    with ``select_lineup_dp``, which is exact for everything but min-games and
+    about twice as fast as a HiGHS solve; HiGHS still runs when that pick
+    spans too few games. The DP's workspace is allocated on its first use
+    and kept for the solver's lifetime, and the DP is skipped when that
+    workspace would exceed ``_DP_MAX_WORKSPACE_BYTES``.
+    """
 
-        prob += pulp.lpSum([game_vars[game] for game in games]) >= min_games
+    def __init__(
+        self, df: pd.DataFrame, min_salary: int, salary_cap: int, roster_size: int, min_games: int,
+        eligible: Optional[np.ndarray] = None, game_to_indices: Optional[Dict[str, np.ndarray]] = None,
+        use_dp: bool = False,
+    ):
+        # Extract columns to NumPy arrays once and work positionally; column k
+        # of the model is row k of df.
+        idx = df.index.to_numpy()
+        sal = df["Salary"].to_numpy()
+        n = len(idx)
+        self.idx = idx
+        self.proj = df["Projection"].to_numpy()
+        self.names = df["Name + ID"].to_numpy()
+        # Slot eligibility is computed once per run by the caller; derive it
+        # here only when called directly (e.g. from a unit test).
+        if eligible is None:
+            eligible = slot_eligibility_matrix(df["Roster Position"])
+
+        inf = highspy.kHighsInf
+        everyone = np.arange(n)
+        # Constraint rows as (lower, upper, columns, coefficients).
+        rows = [
+            (min_salary, salary_cap, everyone, sal.astype(float)),
+            (roster_size, roster_size, everyone, np.ones(n)),
+        ]
 
-        # Solve
-        solver = pulp.HiGHS(msg=False)
-        prob.solve(solver)
+        # Positional: the MILP only picks the eight players; slotting happens
+        # afterwards in slot_lineup_by_time. By Hall's theorem the selection
+        # fills every non-UTIL slot exactly when, for each set U of base
+        # positions, the players eligible somewhere in U are at least as many
+        # as the slots restricted to U (e.g. U={PG,SG} needs 3 for PG/SG/G).
+        # UTIL then takes the eighth player. That is 31 rows and no per-slot
+        # binaries instead of a (player, slot) assignment.
+        base_positions = ROSTER_SLOTS[:5]
+        for r in range(1, len(base_positions) + 1):
+            for cols in itertools.combinations(range(len(base_positions)), r):
+                u = {base_positions[c] for c in cols}
+                required = sum(1 for b in _SLOT_BASE_POSITIONS.values() if b <= u)
+                covered = np.flatnonzero(eligible[:, list(cols)].any(axis=1))
+                rows.append((required, inf, covered, np.ones(len(covered))))
 
-        if pulp.LpStatus[prob.status] != "Optimal":
+        # Min Games
+        # The 'Game' column is pre-processed in load_data and grouped once per
+        # run by the caller; group here only when called directly.
+        if game_to_indices is None:
+            game_to_indices = game_index_map(df)
+        games = list(game_to_indices)
+        n_cols = n
+
+        if min_games == 2 and games:
+            # DraftKings' two-game rule needs no auxiliary variables: a lineup
+            # spans two known games exactly when no single game (together with
+            # any players whose game is unknown) supplies the whole roster.
+            known = np.zeros(n, dtype=bool)
+            for positions in game_to_indices.values():
+                known[positions] = True
+            unknown = np.flatnonzero(~known)
+            for positions in game_to_indices.values():
+                cols = np.concatenate([positions, unknown])
+                rows.append((-inf, roster_size - 1, cols, np.ones(len(cols))))
+        else:
+            # General floor: column n + g is an indicator for "game g is
+            # represented in the lineup". The <= link forces the indicator to 0
+            # unless at least one of that game's players is selected, so
+            # requiring the indicators to sum to >= min_games is a genuine
+            # "span at least min_games distinct games" constraint. A
+            # one-directional >= link would leave the indicators free to switch
+            # on for empty games, making the floor non-binding.
+            n_cols = n + len(games)
+            for g, positions in enumerate(game_to_indices.values()):
+                cols = np.concatenate([[n + g], positions])
+                coefs = np.concatenate([[1.0], -np.ones(len(positions))])
+                rows.append((-inf, 0, cols, coefs))
+            rows.append((min_games, inf, n + np.arange(len(games)), np.ones(len(games))))
+
+        h = highspy.Highs()
+        h.silent()
+        # Solves run one per worker process, so keep HiGHS single-threaded.
+        h.setOptionValue("threads", 1)
+        # Every objective here is a randomly perturbed projection, so proving
+        # optimality past a 0.1% gap buys nothing but branch-and-bound time.
+        h.setOptionValue("mip_rel_gap", 1e-3)
+        h.setOptionValue("mip_abs_gap", 0.01)
+        h.changeObjectiveSense(highspy.ObjSense.kMaximize)
+        h.addCols(
+            n_cols, np.zeros(n_cols), np.zeros(n_cols), np.ones(n_cols),
+            0, np.array([], dtype=np.int32), np.array([], dtype=np.int32), np.array([]),
+        )
+        # Only player columns are integer. Game indicators can stay
+        # continuous in [0, 1]: each is capped by an integer count of its
+        # selected players, so the floor still counts distinct games exactly.
+        h.changeColsIntegrality(
+            n,
+            np.arange(n, dtype=np.int32),
+            np.full(n, highspy.HighsVarType.kInteger),
+        )
+        starts = np.cumsum([0] + [len(r[2]) for r in rows[:-1]]).astype(np.int32)
+        h.addRows(
+            len(rows),
+            np.array([r[0] for r in rows], dtype=float),
+            np.array([r[1] for r in rows], dtype=float),
+            int(sum(len(r[2]) for r in rows)),
+            starts,
+            np.concatenate([r[2] for r in rows]).astype(np.int32),
+            np.concatenate([r[3] for r in rows]).astype(float),
+        )
+        self.highs = h
+        self.player_cols = everyone.astype(np.int32)
+
+        # Opt-in DP fast path: salaries on a common grid (multiples of 100 on DK).
+        self.eligible = eligible
+        self.min_games = min_games
+        self.dp_workspace = None
+        unit = math.gcd(*sal.astype(int).tolist(), int(salary_cap))
+        self.use_dp = (
+            use_dp
+            and roster_size == len(ROSTER_SLOTS)
+            and unit > 0
+            and salary_cap // unit <= _DP_MAX_SALARY_STATES
+            and dp_workspace_bytes(n, eligible.shape[1], salary_cap // unit)
+            <= _DP_MAX_WORKSPACE_BYTES
+        )
+        if self.use_dp:
+            self.salary_units = sal.astype(int) // unit
+            self.cap_units = int(salary_cap) // unit
+            self.min_units = max(0, -(-int(min_salary) // unit))
+            self.game_codes = np.full(n, -1)
+            for code, positions in enumerate(game_to_indices.values()):
+                self.game_codes[positions] = code
+
+    def solve(self, randomness: float) -> Tuple[List[str], Set[int]]:
+        """Solve once against a freshly perturbed projection objective."""
+        return self.solve_many(1, randomness)[0]
+
+    def solve_many(self, count: int, randomness: float) -> List[Tuple[List[str], Set[int]]]:
+        """Solve ``count`` times, drawing every perturbed objective in one call."""
+        if randomness > 0:
+            sims = np.random.normal(
+                self.proj, self.proj * randomness, size=(count, len(self.proj))
+            )
+        else:
+            sims = np.broadcast_to(self.proj, (count, len(self.proj)))
+        return [self.solve_objective(sp) for sp in sims]
+
+    def solve_objective(self, sp: np.ndarray) -> Tuple[List[str], Set[int]]:
+        """Solve against the given per-player objective (simulated projections)."""
+        if self.use_dp:
+            if self.dp_workspace is None:
+                self.dp_workspace = dp_workspace(len(self.idx), self.eligible.shape[1], self.cap_units)
+            picks = select_lineup_dp(
+                sp, self.salary_units, self.eligible, self.min_units, self.cap_units,
+                self.dp_workspace,
+            )
+            if picks is None:
+                # Min-games only removes rosters, so HiGHS cannot do better.
+                return None, None
+            games = self.game_codes[picks]
+            if len(np.unique(games[games >= 0])) >= self.min_games:
+                return list(self.names[picks]), set(self.idx[picks].tolist())
+
+        h = self.highs
+        h.changeColsCost(len(self.player_cols), self.player_cols, np.asarray(sp, dtype=float))
+        h.run()
+
+        if h.getModelStatus() != highspy.HighsModelStatus.kOptimal:
             return None, None
 
-        lineup_names = []
-        selected_indices = set()
+        values = np.asarray(h.getSolution().col_value)[: len(self.idx)]
+        picks = np.flatnonzero(values > 0.5)
+        return list(self.names[picks]), set(self.idx[picks].tolist())
 
-        # Create name dictionary to avoid .loc during result extraction
-        name_dict = df["Name + ID"].to_dict()
-        for i in df.index:
-            if pulp.value(player_vars[i]) > 0.5:
-                lineup_names.append(name_dict[i])
-                selected_indices.add(i)
 
-        return lineup_names, selected_indices
+# --- WORKER FUNCTIONS (MUST BE TOP-LEVEL) ---
+def generate_single_lineup(
+    df: pd.DataFrame, randomness: float, min_salary: int, salary_cap: int, roster_size: int, min_games: int,
+    eligible: Optional[np.ndarray] = None,
+) -> Tuple[List[str], Set[int]]:
+    try:
+        np.random.seed()
+        solver = LineupSolver(df, min_salary, salary_cap, roster_size, min_games, eligible)
+        return solver.solve(randomness)
 
     except Exception:
         traceback.print_exc()
         return None, None
 
 
-def slot_lineup_by_time(lineup_names: List[str], df: pd.DataFrame) -> List[str]:
-    players = df[df["Name + ID"].isin(lineup_names)].copy()
-    if len(players) != 8:
-        return ["ERROR"] * 8
-
-    slot_weights = {
-        "PG": 1,
-        "SG": 1,
-        "SF": 1,
-        "PF": 1,
-        "C": 1,
-        "G": 10,
-        "F": 10,
-        "UTIL": 100,
-    }
-    slots = ROSTER_SLOTS
-
-    start_times = pd.to_datetime(players["StartTime"], errors="coerce")
-    min_time = start_times.min()
-    players["TimeScore"] = (start_times - min_time).dt.total_seconds() / 60.0
-    players["TimeScore"] = players["TimeScore"].fillna(0)
-
-    # --- NEW: Convert to dictionaries for O(1) lookup ---
-    time_score_dict = players["TimeScore"].to_dict()
-    pos_dict = players["Roster Position"].to_dict()
-    name_dict = players["Name + ID"].to_dict()
-
-    prob = pulp.LpProblem("Slotting", pulp.LpMaximize)
-    slot_vars = pulp.LpVariable.dicts("slot", (players.index, slots), cat=pulp.LpBinary)
-
-    # Use time_score_dict instead of players.loc
-    prob += pulp.lpSum(
-        [
-            slot_vars[i][s] * time_score_dict[i] * slot_weights[s]
-            for i in players.index
-            for s in slots
-        ]
-    )
+# Per-process solver, built once by _init_worker when the pool starts.
+_WORKER_SOLVER: Optional[LineupSolver] = None
 
-    for i in players.index:
-        prob += pulp.lpSum([slot_vars[i][s] for s in slots]) == 1
 
-        # Use pos_dict instead of players.loc
-        pos_str = str(pos_dict[i])
+def _init_worker(
+    df: pd.DataFrame, min_salary: int, salary_cap: int, roster_size: int, min_games: int,
+    eligible: Optional[np.ndarray] = None, game_to_indices: Optional[Dict[str, np.ndarray]] = None,
+    use_dp: bool = False,
+) -> None:
+    """ProcessPoolExecutor initializer: receive df once and build the model.
+
+    Passing df through ``initargs`` pickles it once per worker process rather
+    than once per submitted task.
+    """
+    global _WORKER_SOLVER
+    np.random.seed()
+    try:
+        _WORKER_SOLVER = LineupSolver(
+            df, min_salary, salary_cap, roster_size, min_games, eligible, game_to_indices, use_dp
+        )
+    except Exception:
+        traceback.print_exc()
+        _WORKER_SOLVER = None
+
+
+def _solve_batch(count: int, randomness: float) -> List[Tuple[List[str], Set[int]]]:
+    """Generate ``count`` lineups from this worker's cached LineupSolver."""
+    if _WORKER_SOLVER is None:
+        return [(None, None)] * count
+    try:
+        return _WORKER_SOLVER.solve_many(count, randomness)
+
+    except Exception:
+        traceback.print_exc()
+        return [(None, None)] * count
+
+
+def filter_unique_lineups(
+    candidates: List[Tuple[List[str], Set[int]]],
+    pool_index: pd.Index,
+    max_overlap: int,
+    limit: int,
+) -> Tuple[List[List[str]], int]:
+    """Keep candidates sharing at most ``max_overlap`` players with every kept one.
+
+    Each lineup is encoded as a bitmask over player positions in
+    ``pool_index`` (one uint64 word per 64 players), so a candidate's overlap
+    with all kept lineups is a single vectorized AND + popcount instead of a
+    Python set intersection per kept lineup.
+
+    Returns:
+        The kept lineups' names (at most ``limit``) and the number of
+        candidates rejected for overlapping too much.
+    """
+    n_words = (len(pool_index) + 63) // 64
+    kept_bits = np.zeros((limit, n_words), dtype=np.uint64)
+    kept_names = []
+    rejected = 0
+    # Exact repeats (common at low randomness) are rejected by a set lookup
+    # before any bit work, unless max_overlap permits identical lineups.
+    seen = set()
+
+    for names, indices in candidates:
+        if len(kept_names) >= limit:
+            break
+
+        key = frozenset(indices)
+        if max_overlap < len(key):
+            if key in seen:
+                rejected += 1
+                continue
+            seen.add(key)
+
+        positions = pool_index.get_indexer(list(indices))
+        bits = np.zeros(n_words, dtype=np.uint64)
+        np.bitwise_or.at(
+            bits, positions // 64, np.left_shift(np.uint64(1), (positions % 64).astype(np.uint64))
+        )
+
+        n_kept = len(kept_names)
+        if n_kept:
+            overlap = np.bitwise_count(kept_bits[:n_kept] & bits).sum(axis=1)
+            if (overlap > max_overlap).any():
+                rejected += 1
+                continue
+
+        kept_bits[n_kept] = bits
+        kept_names.append(names)
+
+    return kept_names, rejected
+
+
+# Slot weights for time-based slotting: later starters go to flex slots.
+_SLOT_TIME_WEIGHTS = {
+    "PG": 1,
+    "SG": 1,
+    "SF": 1,
+    "PF": 1,
+    "C": 1,
+    "G": 10,
+    "F": 10,
+    "UTIL": 100,
+}
 
-        for s in slots:
-            eligible = False
-            if s == "UTIL":
-                eligible = True
-            elif s == "G":
-                eligible = "PG" in pos_str or "SG" in pos_str
-            elif s == "F":
-                eligible = "SF" in pos_str or "PF" in pos_str
-            else:
-                eligible = s in pos_str
 
-            if not eligible:
-                prob += slot_vars[i][s] == 0
+class LineupSlotter:
+    """Time-based slotting for lineups drawn from one pool.
 
-    for s in slots:
-        prob += pulp.lpSum([slot_vars[i][s] for i in players.index]) == 1
+    Names, start times and slot eligibility are pulled out of ``df`` once as
+    parallel arrays, so slotting each lineup is a dict lookup per player and
+    an 8x8 ``assign_slots`` call, with no DataFrame work per lineup.
+    """
+
+    def __init__(self, df: pd.DataFrame, eligible: Optional[np.ndarray] = None):
+        """``eligible`` is the pool-wide ``slot_eligibility_matrix`` of ``df``
+        (rows aligned positionally); it is derived here when not supplied."""
+        self.names = df["Name + ID"].to_numpy()
+        self.positions = {}
+        for pos, name in enumerate(self.names.tolist()):
+            self.positions.setdefault(name, []).append(pos)
+        if eligible is None:
+            eligible = slot_eligibility_matrix(df["Roster Position"])
+        self.eligible = eligible
+        # Start times as seconds after the pool's first tip (NaN if unknown).
+        start_times = pd.to_datetime(df["StartTime"], errors="coerce")
+        self.start_seconds = (start_times - start_times.min()).dt.total_seconds().to_numpy()
+        self.slot_weights = np.array([_SLOT_TIME_WEIGHTS[s] for s in ROSTER_SLOTS])
+
+    def slot(self, lineup_names: List[str]) -> List[str]:
+        """Place a selected lineup into DK slots, pushing late starters to flex."""
+        picks = sorted(
+            pos for name in set(lineup_names) for pos in self.positions.get(name, ())
+        )
+        if len(picks) != 8:
+            return ["ERROR"] * 8
+
+        # Minutes after the lineup's earliest start; unknown times score 0.
+        seconds = self.start_seconds[picks]
+        if np.isnan(seconds).all():
+            time_score = np.zeros(len(picks))
+        else:
+            time_score = np.nan_to_num((seconds - np.nanmin(seconds)) / 60.0)
 
-    prob.solve(pulp.HiGHS(msg=False))
+        # An 8x8 assignment is far too small to justify a MIP solve; solve it
+        # exactly with the bitmask DP in utils.assign_slots instead.
+        assignment = assign_slots(
+            self.eligible[picks], np.outer(time_score, self.slot_weights)
+        )
+        if assignment is None:
+            return ["ERROR"] * 8
+
+        names = self.names[picks]
+        final_lineup = {ROSTER_SLOTS[s_idx]: names[k] for k, s_idx in enumerate(assignment)}
+        return [final_lineup.get(s, "EMPTY") for s in ROSTER_SLOTS]
 
-    final_lineup = {}
-    for i in players.index:
-        for s in slots:
-            if pulp.value(slot_vars[i][s]) > 0.5:
-                # Use name_dict instead of players.loc
-                final_lineup[s] = name_dict[i]
 
-    return [final_lineup.get(s, "EMPTY") for s in slots]
+def slot_lineup_by_time(
+    lineup_names: List[str], df: pd.DataFrame, eligible: Optional[np.ndarray] = None
+) -> List[str]:
+    """Place a selected lineup into DK slots, pushing late starters to flex.
+
+    One-off convenience wrapper around ``LineupSlotter``; ``run`` keeps one
+    slotter for the whole pool instead of re-extracting it per lineup.
+    """
+    return LineupSlotter(df, eligible).slot(lineup_names)
 
 
 def run(
@@ -215,12 +537,13 @@ def run(
     num_lineups: int = 2500,
     randomness: float = 0.25,
     min_unique: int = 1,
-) -> str:
+) -> Tuple[str, Optional[pd.DataFrame]]:
     """Run the lineup generation engine.
 
     Returns:
-        Path to the written lineup-pool CSV, or an empty string if the run
-        failed before producing output.
+        Path to the written lineup-pool CSV and the lineup pool itself, so an
+        in-process caller can hand the frame to the ranker without re-reading
+        the file. ``("", None)`` if the run failed before producing output.
     """
     print("Starting NBA DFS Optimizer (Parallel Mode)...")
     print(
@@ -230,10 +553,7 @@ def run(
     # Check if randomness is 0
     if randomness <= 0:
         print(
-            "WARNING: Randomness is 0. Parallel workers will likely generate identical lineups."
-        )
-        print(
-            "Using sequential Iterative Exclusion logic instead? No, this script is now Parallel-only."
+            "WARNING: Randomness is 0. Every worker would solve the identical LP, so only one lineup will be generated."
         )
         print("Please enable randomness (>0) for parallel mode efficiency.")
 
@@ -244,6 +564,8 @@ def run(
         df = load_data(projs_file, cfg.entries_path)
         df = df[df["Projection"] >= cfg.min_projection]
         print(f"Loaded {len(df)} players with proj >= {cfg.min_projection}")
+        eligible = slot_eligibility_matrix(df["Roster Position"])
+        game_to_indices = game_index_map(df)
 
         # DEPRECATED - randomness of 0.25 renders duplicates mathematically improbable
         # Strategy: Generate more than needed to account for duplicates/overlap
@@ -251,7 +573,12 @@ def run(
         # oversample_factor = 1 if min_unique > 1 else 1.25
         # target_lineups = int(target_lineups * oversample_factor)
 
-        target_lineups = num_lineups
+        # Workers are independently seeded, so with randomness > 0 every solve
+        # explores a different objective and the uniqueness filter below does
+        # the dedup. With no randomness every solve returns the same lineup,
+        # which the filter discards anyway (unless min_unique allows exact
+        # repeats) -- so solve it once.
+        target_lineups = num_lineups if randomness > 0 or min_unique <= 0 else 1
 
         print(
             f"Spinning up pool with {multiprocessing.cpu_count()} cores to generate ~{target_lineups} candidates..."
@@ -262,33 +589,50 @@ def run(
         # Start the timer
         start_time = time.perf_counter()
 
-        with concurrent.futures.ProcessPoolExecutor() as executor:
-            # We must pass df, randomness, and min_salary to each worker
-            # Since df is static, it gets pickled once (or shared via COW on Linux, but picked on Windows)
-            futures = [
-                executor.submit(
-                    generate_single_lineup, df, randomness, cfg.min_salary, cfg.salary_cap, cfg.roster_size, cfg.min_games
-                )
-                for _ in range(target_lineups)
-            ]
+        # Batch lineups per task to cut IPC round-trips. Aim for several
+        # batches per core to keep the cores evenly loaded.
+        batch_size = max(
+            1, min(25, target_lineups // (multiprocessing.cpu_count() * 4))
+        )
+        batch_counts = [batch_size] * (target_lineups // batch_size)
+        if target_lineups % batch_size:
+            batch_counts.append(target_lineups % batch_size)
+
+        # df and the static constraints go to each worker once via the
+        # initializer; tasks then carry only a batch size and the randomness.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=multiprocessing.cpu_count(),
+            initializer=_init_worker,
+            initargs=(
+                df, cfg.min_salary, cfg.salary_cap, cfg.roster_size, cfg.min_games, eligible, game_to_indices,
+                cfg.lineup_dp,
+            ),
+        ) as executor:
+            futures = {
+                executor.submit(_solve_batch, count, randomness): count
+                for count in batch_counts
+            }
 
             # Calculate the iteration interval for 20% chunks once, outside the loop
             interval = max(1, target_lineups // 5)
+            completed = 0
+            next_report = interval
 
-            for i, future in enumerate(concurrent.futures.as_completed(futures)):
+            for future in concurrent.futures.as_completed(futures):
                 try:
-                    names, indices = future.result()
-                    if names and indices:
-                        candidates.append((names, indices))
-
-                    # Only do the math and print when hitting the interval or the final task
-                    if (i + 1) % interval == 0 or (i + 1) == target_lineups:
-                        percentage = int(((i + 1) / target_lineups) * 100)
-                        print(f"Lineups generated: {percentage}%")
-
+                    for names, indices in future.result():
+                        if names and indices:
+                            candidates.append((names, indices))
                 except Exception as exc:
                     print(f"Worker generated exception: {exc}")
 
+                # Only do the math and print when crossing the interval or finishing
+                completed += futures[future]
+                if completed >= next_report or completed == target_lineups:
+                    percentage = int((completed / target_lineups) * 100)
+                    print(f"Lineups generated: {percentage}%")
+                    next_report = (completed // interval + 1) * interval
+
         # Stop the timer and calculate the duration
         end_time = time.perf_counter()
         execution_time = end_time - start_time
@@ -299,26 +643,10 @@ def run(
         # print(f"Total solver time: {execution_time:.2f} seconds")
 
         # Filter for Uniqueness / Min Unique
-        valid_raw_names = []
-        selected_indices_list = []
-        duplicates_removed = 0
-
         print("Filtering candidates for uniqueness, then slotting by start time...")
-        for names, indices in candidates:
-            if len(valid_raw_names) >= target_lineups:
-                break
-
-            is_valid = True
-            for prev_indices in selected_indices_list:
-                overlap = len(indices.intersection(prev_indices))
-                if overlap > (cfg.roster_size - min_unique):
-                    is_valid = False
-                    duplicates_removed += 1
-                    break
-
-            if is_valid:
-                valid_raw_names.append(names)
-                selected_indices_list.append(indices)
+        valid_raw_names, duplicates_removed = filter_unique_lineups(
+            candidates, df.index, cfg.roster_size - min_unique, target_lineups
+        )
 
         # DEPRECATED as part of oversampling removal
         # excess_discarded = len(candidates) - len(valid_raw_names) - duplicates_removed
@@ -327,20 +655,10 @@ def run(
         # DEPRECATED as part of oversampling removal
         # print(f"Excess candidates discarded unread: {excess_discarded}")
 
-        # Parallelize the slotting process
-        # print("Slotting final lineups by start time...")
-        final_lineups = []
-
-        with concurrent.futures.ProcessPoolExecutor() as executor:
-            # map() executes in parallel but yields results in the original order
-            results = executor.map(
-                slot_lineup_by_time,
-                valid_raw_names,
-                itertools.repeat(df, len(valid_raw_names)),
-            )
-
-            for slotted in results:
-                final_lineups.append(slotted)
+        # Slotting is a tiny exact assignment per lineup, so run it in-process;
+        # shipping df to a process pool would cost more than the work itself.
+        slotter = LineupSlotter(df, eligible)
+        final_lineups = [slotter.slot(names) for names in valid_raw_names]
 
         print(f"Final valid lineups slotted and selected: {len(final_lineups)}")
 
@@ -357,12 +675,12 @@ def run(
         )
         out_df.to_csv(output_file, index=False)
         print(f"Saved {len(final_lineups)} lineups to {output_file}")
-        return output_file
+        return output_file, out_df
 
     except Exception as e:
         print(f"Error: {e}")
         traceback.print_exc()
-        return ""
+        return "", None
 
 
 def main():
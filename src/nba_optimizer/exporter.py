@@ -10,7 +10,9 @@ from .config import Config, ROSTER_SLOTS, STANDARD_EXPORT_PREFIX
 from .utils import get_latest_file, read_ragged_csv
 
 
-def run(cfg: Config, ranked_file: Optional[str] = None) -> str:
+def run(
+    cfg: Config, ranked_file: Optional[str] = None, df_ranked: Optional[pd.DataFrame] = None
+) -> str:
     """Export top-ranked lineups into a DraftKings-compatible CSV.
 
     Args:
@@ -18,6 +20,9 @@ def run(cfg: Config, ranked_file: Optional[str] = None) -> str:
         ranked_file: Explicit path to a ranked-lineups CSV. When omitted, the
             most recent file in ``cfg.ranked_lineup_dir`` is used (standalone
             fallback behaviour).
+        df_ranked: The ranked lineups already in memory (as returned by
+            ``ranker.run``). When given, they are exported instead of reading
+            ``ranked_file``.
 
     Returns:
         Path to the written export CSV, or an empty string if the run failed
@@ -39,10 +44,12 @@ def run(cfg: Config, ranked_file: Optional[str] = None) -> str:
 
         # 3. Load ranked lineups — use explicit path when provided, otherwise fall
         #    back to latest-file discovery (standalone / direct module invocation).
-        if not ranked_file:
-            ranked_file = get_latest_file(cfg.ranked_lineup_dir, "ranked-lineups-*.csv")
-        print(f"Using ranked lineups from: {os.path.basename(ranked_file)}")
-        df_ranked = pd.read_csv(ranked_file)
+        if df_ranked is None:
+            if not ranked_file:
+                ranked_file = get_latest_file(cfg.ranked_lineup_dir, "ranked-lineups-*.csv")
+            df_ranked = pd.read_csv(ranked_file)
+        if ranked_file:
+            print(f"Using ranked lineups from: {os.path.basename(ranked_file)}")
 
         if len(df_ranked) < entry_count:
             print(
@@ -60,12 +67,12 @@ def run(cfg: Config, ranked_file: Optional[str] = None) -> str:
             if slot in df_entries.columns:
                 df_entries[slot] = df_entries[slot].astype("object")
 
-        valid_indices = df_entries.index[valid_mask].tolist()
-
-        for i in range(fill_count):
-            target_idx = valid_indices[i]
-            for slot in slots:
-                df_entries.loc[target_idx, slot] = df_ranked.loc[i, slot]
+        # Write all filled entries in one block assignment rather than one
+        # scalar .loc set per (entry, slot).
+        target_indices = df_entries.index[valid_mask][:fill_count]
+        df_entries.loc[target_indices, list(slots)] = (
+            df_ranked[list(slots)].iloc[:fill_count].to_numpy()
+        )
 
         # 5. Save the combined file
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
@@ -6,7 +6,10 @@ from typing import Optional
 import pandas as pd
 
 from .config import LATE_SWAP_PREFIX, ROSTER_SLOTS, STANDARD_EXPORT_PREFIX, Config
-from .utils import get_latest_file
+from .utils import get_latest_file, load_projections, player_ids
+
+# Trailing " (ID)" plus anything after it, e.g. " (42062851) (LOCKED)".
+_ID_SUFFIX_RE = re.compile(r"\s*\(\d+\).*$")
 
 
 def _resolve_entries_file(cfg: Config, entries_file: Optional[str] = None) -> str:
@@ -54,8 +57,7 @@ def run(cfg: Config, top_x: int = 25, entries_file: Optional[str] = None):
         projs_file = get_latest_file(cfg.projs_dir, "NBA-Projs-*.csv", use_mtime=True)
 
         # 2. Parse Projections for Ownership
-        df_projs = pd.read_csv(projs_file)
-        df_projs["ID"] = df_projs["ID"].astype(str)
+        df_projs = load_projections(projs_file)
         # Create a dictionary mapping ID to Projected Ownership
         own_dict = df_projs.set_index("ID")["Own_Proj"].to_dict()
 
@@ -84,29 +86,20 @@ def run(cfg: Config, top_x: int = 25, entries_file: Optional[str] = None):
         # 5. Calculate Exposures
         exposure_counts = pd.Series(all_players).value_counts()
 
-        report_data = []
-        for player_str, count in exposure_counts.items():
-            # Extract ID from string like "Giannis Antetokounmpo (42062851) (LOCKED)"
-            id_match = re.search(r"\((\d+)\)", str(player_str))
-            player_id = id_match.group(1) if id_match else None
-
-            # Clean up name for display
-            name = re.sub(r"\s*\(\d+\).*$", "", str(player_str))
-
-            exposure_pct = (count / total_lineups) * 100
-            own_pct = own_dict.get(player_id, 0.0) if player_id else 0.0
-            leverage = exposure_pct - own_pct
-
-            report_data.append(
-                {
-                    "Player": name,
-                    "Exposure %": exposure_pct,
-                    "Proj Own %": own_pct,
-                    "Leverage": leverage,
-                }
-            )
-
-        df_report = pd.DataFrame(report_data)
+        # One vectorized pass over the distinct player strings: IDs for the
+        # ownership lookup and display names with the " (ID) ..." tail removed.
+        labels = exposure_counts.index.to_series()
+        own_pct = [
+            own_dict.get(pid, 0.0) if pid else 0.0 for pid in player_ids(labels)
+        ]
+        df_report = pd.DataFrame(
+            {
+                "Player": labels.str.replace(_ID_SUFFIX_RE, "", regex=True).to_numpy(),
+                "Exposure %": (exposure_counts.to_numpy() / total_lineups) * 100,
+                "Proj Own %": own_pct,
+            }
+        )
+        df_report["Leverage"] = df_report["Exposure %"] - df_report["Proj Own %"]
         df_report = df_report.sort_values(by="Exposure %", ascending=False).reset_index(
             drop=True
         )
@@ -1,27 +1,37 @@
 import argparse
+import concurrent.futures
+import itertools
+import multiprocessing
 import os
 import traceback
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+import highspy
+import numpy as np
 import pandas as pd
-import pulp
 
 from .config import Config, ENTRY_HEADER_COLS, LATE_SWAP_PREFIX, ROSTER_SLOTS
 from .utils import (
+    assign_slots,
     derive_game_key,
     extract_player_id,
     get_latest_file,
     is_player_locked,
+    load_projections,
+    locked_flags,
     merge_player_pool,
     parse_dk_entries,
-    parse_game_time,
+    parse_game_times,
+    player_ids,
     read_ragged_csv,
+    read_text,
+    slot_eligibility_matrix,
 )
 
 
-def _attach_game_column(df: pd.DataFrame) -> None:
-    """Add a canonical, order-independent "Game" column to ``df`` in place.
+def _game_keys(df: pd.DataFrame) -> List[str]:
+    """Canonical, order-independent game key for each row of ``df``.
 
     Prefers the projections team/opponent pair (which survives DraftKings'
     "In Progress" relabeling of started games), falling back to the pool's
@@ -49,229 +59,559 @@ def _attach_game_column(df: pd.DataFrame) -> None:
         if "Game Info" in df.columns
         else pd.Series([""] * n, index=df.index)
     )
-    df["Game"] = [
+    return [
         derive_game_key(t, o, gi)
         for t, o, gi in zip(team_series, opp_series, game_info_series)
     ]
 
 
-def load_data(projs_file: str, entries_file: str) -> pd.DataFrame:
-    """Loads player pool and projections."""
-    df_players = parse_dk_entries(entries_file)
-    df_projs = pd.read_csv(projs_file)
+def _attach_game_column(df: pd.DataFrame) -> None:
+    """Add the canonical "Game" column (see ``_game_keys``) to ``df`` in place."""
+    df["Game"] = _game_keys(df)
+
+
+def load_data(projs_file: str, entries_file: str, entries_text: Optional[str] = None) -> pd.DataFrame:
+    """Loads player pool and projections.
+
+    ``entries_text`` is the already-read DKEntries file, when the caller has it.
+    """
+    df_players = parse_dk_entries(entries_file, entries_text)
+    df_projs = load_projections(projs_file)
     df_pool = merge_player_pool(df_players, df_projs, how="left")
     _attach_game_column(df_pool)
+    df_pool["Salary"] = df_pool["Salary"].astype(np.int32)
     return df_pool
 
 
-def solve_late_swap_batch(
-    df_pool: pd.DataFrame,
-    current_lineup_ids: List[str],
-    cfg: Config,
-    num_to_generate: int,
-) -> List[List[str]]:
-    """Optimizes the remaining slots of a lineup and generates a batch of unique variations."""
-    slots = ROSTER_SLOTS
-    flex_scores = {
-        "UTIL": 3,
-        "G": 2,
-        "F": 2,
-        "PG": 1,
-        "SG": 1,
-        "SF": 1,
-        "PF": 1,
-        "C": 1,
-    }
-
-    # The canonical "Game" column is normally added in load_data; derive it
-    # here too if this is called with a bare pool (e.g. a unit test) so
-    # locked-game accounting below always has a consistent key to read.
-    if "Game" not in df_pool.columns:
-        _attach_game_column(df_pool)
-
-    locked_ids = set()
-    lineup_map = {}
-    filled_slots = [False] * len(slots)
-    locked_salary_used = 0
-    locked_games = set()
-
-    # 1. Identify Locked Players and their slots
-    for i, p_str in enumerate(current_lineup_ids):
-        pid = extract_player_id(p_str)
-        is_locked = False
-        if pid:
-            if is_player_locked(p_str):
-                is_locked = True
-            else:
-                player_data = df_pool[df_pool["ID"] == pid]
-                if not player_data.empty and is_player_locked(
-                    player_data.iloc[0].get("Name + ID", "")
-                ):
-                    is_locked = True
-
-        if is_locked:
-            lineup_map[slots[i]] = p_str
-            filled_slots[i] = True
-            if pid:
-                locked_ids.add(pid)
-                player_data = df_pool[df_pool["ID"] == pid]
-                if not player_data.empty:
-                    locked_salary_used += player_data.iloc[0]["Salary"]
-                    locked_games.add(player_data.iloc[0]["Game"])
-
-    # Fast path: If the lineup is completely locked, return it N times.
-    num_to_fill = sum(1 for filled in filled_slots if not filled)
-    if num_to_fill == 0:
-        return [
-            [lineup_map.get(s, "EMPTY") for s in slots] for _ in range(num_to_generate)
-        ]
+def pool_id_lookup(df_pool: pd.DataFrame) -> Tuple[Dict[str, int], np.ndarray]:
+    """Map each pool ID to its row position, and flag rows marked (LOCKED).
 
-    # 2. Setup Solver Base
-    prob = pulp.LpProblem("NBA_Late_Swap", pulp.LpMaximize)
-    player_vars = pulp.LpVariable.dicts("player", df_pool.index, cat=pulp.LpBinary)
+    The first row wins for a duplicated ID, matching the ``iloc[0]`` of the
+    boolean-mask lookups this replaces.
+    """
+    ids = df_pool["ID"].tolist()
+    id_to_pos = {}
+    for pos, pid in enumerate(ids):
+        id_to_pos.setdefault(pid, pos)
+    return id_to_pos, locked_flags(df_pool["Name + ID"])
 
-    # Convert DataFrame columns to dictionaries for O(1) lookup (optimization pattern from engine.py)
-    projection_dict = df_pool["Projection"].to_dict()
-    salary_dict = df_pool["Salary"].to_dict()
-    pos_dict = df_pool["Roster Position"].to_dict()
-    name_dict = df_pool["Name + ID"].to_dict()
-    id_dict = df_pool["ID"].to_dict()
 
-    base_obj = pulp.lpSum(
-        [projection_dict[i] * player_vars[i] for i in df_pool.index]
-    )
+def _entry_lock(
+    p_str: str, id_to_pos: Dict[str, int], locked_mask: np.ndarray
+) -> Tuple[Optional[str], Optional[int], bool]:
+    """Resolve one entry cell to ``(player ID, pool row, is locked)``.
 
-    available_slots = [slots[i] for i, filled in enumerate(filled_slots) if not filled]
-    slot_vars = pulp.LpVariable.dicts(
-        "slot", (df_pool.index, available_slots), cat=pulp.LpBinary
+    The pool's precomputed lock flag is checked first; the entry string is
+    only searched for the (LOCKED) marker when the pool row is not flagged
+    (e.g. a player missing from the filtered pool).
+    """
+    pid = extract_player_id(p_str)
+    if not pid:
+        return None, None, False
+    pos = id_to_pos.get(pid)
+    if pos is not None and locked_mask[pos]:
+        return pid, pos, True
+    return pid, pos, is_player_locked(p_str)
+
+
+def entry_player_arrays(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Player IDs and (LOCKED) markers for a 2-D array of entry cells.
+
+    One vectorized regex pass over every cell replaces per-cell
+    ``extract_player_id``/``is_player_locked`` calls. Returns an object array
+    of IDs (None where a cell has no ID) and a boolean array of markers,
+    both shaped like ``cells``.
+    """
+    flat = pd.Series(cells.ravel(), dtype=object)
+    return (
+        player_ids(flat).reshape(cells.shape),
+        locked_flags(flat).reshape(cells.shape),
     )
 
-    # Pre-compute time scores and store in dictionary for O(1) lookup
-    incentive_terms = []
-    if "StartTime" not in df_pool.columns:
-        if "Game Info" in df_pool.columns:
-            df_pool["StartTime"] = df_pool["Game Info"].apply(parse_game_time)
-        else:
-            df_pool["StartTime"] = pd.Timestamp.max
-    min_time = df_pool["StartTime"].min()
-    max_time = df_pool["StartTime"].max()
-    time_range = (max_time - min_time).total_seconds() or 1.0
-
-    # Convert StartTime to dict and compute time scores once
-    start_time_dict = df_pool["StartTime"].to_dict()
-    time_score_dict = {}
-    for i in df_pool.index:
-        time_score_dict[i] = (start_time_dict[i] - min_time).total_seconds() / time_range
-
-    for i in df_pool.index:
-        for s in available_slots:
-            weight = time_score_dict[i] * flex_scores.get(s, 1) * 0.001
-            incentive_terms.append(slot_vars[i][s] * weight)
-
-    prob += base_obj + pulp.lpSum(incentive_terms)
-
-    prob += (
-        pulp.lpSum([salary_dict[i] * player_vars[i] for i in df_pool.index])
-        <= cfg.salary_cap - locked_salary_used
-    )
-    adj_min_salary = max(0, cfg.min_salary - locked_salary_used)
-    prob += (
-        pulp.lpSum([salary_dict[i] * player_vars[i] for i in df_pool.index])
-        >= adj_min_salary
-    )
-    prob += pulp.lpSum([player_vars[i] for i in df_pool.index]) == num_to_fill
-
-    # Use name_dict to check locked players instead of df.loc
-    for i in df_pool.index:
-        if is_player_locked(name_dict[i]):
-            prob += player_vars[i] == 0
-
-    # Use pos_dict for position eligibility instead of df.loc
-    for i in df_pool.index:
-        prob += pulp.lpSum([slot_vars[i][s] for s in available_slots]) == player_vars[i]
-        pos_str = str(pos_dict[i])
-        for s in available_slots:
-            eligible = False
-            if s == "UTIL":
-                eligible = True
-            elif s == "G":
-                eligible = "PG" in pos_str or "SG" in pos_str
-            elif s == "F":
-                eligible = "SF" in pos_str or "PF" in pos_str
-            else:
-                eligible = s in pos_str
-
-            if not eligible:
-                prob += slot_vars[i][s] == 0
-
-    for s in available_slots:
-        prob += pulp.lpSum([slot_vars[i][s] for i in df_pool.index]) == 1
-
-    # The floor counts only games NOT already covered by locked players; those
-    # are credited via adj_min_games below. Restricting to new games keeps
-    # len(locked_games) + (new games selected) an exact distinct-game count
-    # even for a "mixed" game that holds both a locked player and a draftable
-    # one -- otherwise that single physical game could satisfy the floor twice.
-    # game_vars[g] can only be 1 when at least one of g's players is drafted
-    # into an open slot; this <= link is what makes the >= floor binding (a
-    # one-directional >= link would leave it non-binding). The groupby mirrors
-    # the lookup pattern in engine.py instead of boolean-indexing in the loop.
-    new_games = [
-        g
-        for g in df_pool["Game"].unique()
-        if g not in locked_games and pd.notna(g) and g != ""
-    ]
-    game_vars = pulp.LpVariable.dicts("game", new_games, cat=pulp.LpBinary)
-    game_to_players = df_pool.groupby("Game").groups
 
-    for game in new_games:
-        players_in_game = game_to_players[game]
-        prob += game_vars[game] <= pulp.lpSum(
-            [player_vars[i] for i in players_in_game]
-        )
+def pool_swap_arrays(df_pool: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-player slot eligibility and start-time scores for late swap.
 
-    adj_min_games = max(0, cfg.min_games - len(locked_games))
-    if adj_min_games > 0:
-        prob += pulp.lpSum([game_vars[game] for game in new_games]) >= adj_min_games
+    Both depend only on the pool, so ``run`` computes them once and hands
+    them to every ``solve_late_swap_batch`` call instead of re-deriving them
+    per base state. Rows follow ``df_pool`` positionally; eligibility columns
+    follow ``ROSTER_SLOTS`` and time scores run from 0 (earliest) to 1.
+    ``df_pool`` is only read; start times are parsed from "Game Info" when
+    it has no "StartTime" column.
+    """
+    if "StartTime" in df_pool.columns:
+        start_times = df_pool["StartTime"]
+    elif "Game Info" in df_pool.columns:
+        start_times = parse_game_times(df_pool["Game Info"])
+    else:
+        start_times = pd.Series(pd.NaT, index=df_pool.index)
+    elapsed = pd.to_datetime(start_times, errors="coerce")
+    elapsed = (elapsed - elapsed.min()).dt.total_seconds()
+    time_range = elapsed.max()
+    if not time_range > 0:
+        time_range = 1.0
+    # Unparseable times (e.g. "In Progress" games) score as latest, as the
+    # datetime.max fallback of parse_game_time intended. Scaling over the
+    # parsed times only keeps one such player from flattening everyone
+    # else's score to ~0.
+    time_scores = (elapsed / time_range).fillna(1.0).to_numpy()
+    return slot_eligibility_matrix(df_pool["Roster Position"]), time_scores
+
+
+# Flex slots are preferred for later starters so they stay swappable.
+_FLEX_SCORES = {
+    "UTIL": 3,
+    "G": 2,
+    "F": 2,
+    "PG": 1,
+    "SG": 1,
+    "SF": 1,
+    "PF": 1,
+    "C": 1,
+}
+
+
+class LateSwapSolver:
+    """Late-swap MILP over one pool, built once and re-bounded per base state.
+
+    Columns are the players not locked in the pool; the MILP only picks who
+    is drafted, and ``utils.assign_slots`` places them in the open slots
+    afterwards. The salary band, the roster count and one Hall row per set
+    of non-UTIL slots are built here. ``solve`` then only switches columns
+    and Hall rows on or off for the entry's locks, adds its game-floor and
+    no-good rows, and removes them again afterwards.
+    """
 
-    # 3. Iterative Batch Solving
-    generated_lineups = []
+    def __init__(
+        self,
+        df_pool: pd.DataFrame,
+        cfg: Config,
+        eligible: Optional[np.ndarray] = None,
+        time_scores: Optional[np.ndarray] = None,
+        id_lookup: Optional[Tuple[Dict[str, int], np.ndarray]] = None,
+    ):
+        """``eligible``/``time_scores`` come from ``pool_swap_arrays`` and
+        ``id_lookup`` from ``pool_id_lookup``; they are derived here only when
+        not supplied (e.g. from a unit test)."""
+        self.cfg = cfg
+
+        # The canonical "Game" column is normally added in load_data; derive
+        # the keys locally if this is called with a bare pool (e.g. a unit
+        # test) so locked-game accounting always has a consistent key to
+        # read. df_pool itself is never written to here.
+        if "Game" in df_pool.columns:
+            games = df_pool["Game"]
+        else:
+            games = pd.Series(_game_keys(df_pool), index=df_pool.index)
+        if eligible is None or time_scores is None:
+            eligible, time_scores = pool_swap_arrays(df_pool)
+        self.id_to_pos, self.locked_mask = id_lookup or pool_id_lookup(df_pool)
+        self.pool_games = games.to_numpy()
+        self.pool_salary = df_pool["Salary"].to_numpy(dtype=float)
+
+        # Players locked in the pool can never be drafted, so they get no
+        # columns; column k is the k-th remaining player in pool order.
+        draftable = np.flatnonzero(~self.locked_mask & eligible.any(axis=1))
+        game_codes, self.game_labels = pd.factorize(games, sort=False)
+        self.flex = np.array([_FLEX_SCORES.get(s, 1) * 0.001 for s in ROSTER_SLOTS])
+        proj = df_pool["Projection"].to_numpy(dtype=float)[draftable]
+
+        self.n_players = n = len(draftable)
+        self.eligible = eligible[draftable]
+        self.time_scores = time_scores[draftable]
+        # Integer ID codes let each base state drop its entry-locked players
+        # with an integer isin rather than comparing ID strings.
+        id_codes, id_uniques = pd.factorize(df_pool["ID"])
+        self.id_code = {pid: code for code, pid in enumerate(id_uniques)}
+        self.player_id_code = id_codes[draftable]
+        self.player_sal = self.pool_salary[draftable]
+        self.player_game = game_codes[draftable]
+        # Later starters get a tie-break nudge toward being drafted, as they
+        # keep the lineup swappable; which slot they fill is settled by
+        # assign_slots with the per-slot flex weights.
+        self.player_score = proj + self.time_scores * 0.001
+        self.names = df_pool["Name + ID"].to_numpy()[draftable]
+        # Pool row -> model column (-1 for pool-locked or unplaceable rows).
+        self.col_of_pos = np.full(len(df_pool), -1)
+        self.col_of_pos[draftable] = np.arange(n)
+
+        # (player, slot) pairs rank candidates when one slot is open and seed
+        # the greedy start; np.nonzero yields them in player order.
+        self.pair_player, self.pair_slot = np.nonzero(self.eligible)
+        self.pair_score = proj[self.pair_player] + self.time_scores[self.pair_player] * self.flex[self.pair_slot]
+
+        # Positional: by Hall's theorem the drafted players fill the open
+        # slots exactly when, for every set S of open non-UTIL slots, at
+        # least |S| of them are eligible somewhere in S (UTIL takes anyone).
+        # One row per set is built here; sets touching a locked slot are
+        # relaxed per base state.
+        hall_slots = [j for j, s in enumerate(ROSTER_SLOTS) if s != "UTIL"]
+        self.hall_sets = np.array(
+            [
+                [j in subset for j in range(len(ROSTER_SLOTS))]
+                for r in range(1, len(hall_slots) + 1)
+                for subset in itertools.combinations(hall_slots, r)
+            ]
+        )
 
-    for iteration in range(num_to_generate):
-        solver = pulp.HiGHS(msg=False)
-        prob.solve(solver)
+        h = highspy.Highs()
+        h.silent()
+        # Base states run one per worker process, so keep HiGHS single-threaded.
+        h.setOptionValue("threads", 1)
+        inf = highspy.kHighsInf
+        h.addVars(n, np.zeros(n), np.ones(n))
+        everyone = np.arange(n, dtype=np.int32)
+        # Row 0 is the salary band, row 1 the roster count and the rest the
+        # Hall rows; their bounds are set per base state.
+        rows = [(-inf, inf, everyone, self.player_sal), (0, 0, everyone, np.ones(n))]
+        for subset in self.hall_sets:
+            covered = np.flatnonzero(self.eligible[:, subset].any(axis=1))
+            rows.append((-inf, inf, covered, np.ones(len(covered))))
+        _add_rows(h, rows)
+        # Only player columns are integer; game indicators stay continuous
+        # (see the general floor in solve).
+        h.changeColsIntegrality(n, everyone, np.full(n, highspy.HighsVarType.kInteger))
+        h.changeColsCost(n, everyone, self.player_score)
+        h.changeObjectiveSense(highspy.ObjSense.kMaximize)
+        self.highs = h
+        self.n_base_rows = h.getNumRow()
+
+    def solve(self, current_lineup_ids: List[str], num_to_generate: int) -> List[List[str]]:
+        """Optimizes the remaining slots of a lineup and generates a batch of unique variations."""
+        cfg = self.cfg
+        slots = ROSTER_SLOTS
 
-        if pulp.LpStatus[prob.status] != "Optimal":
-            if iteration == 0:
-                print(
-                    f"Warning: Could not optimize lineup for base state. Status: {pulp.LpStatus[prob.status]}"
-                )
+        locked_ids = set()
+        lineup_map = {}
+        filled_slots = np.zeros(len(slots), dtype=bool)
+        locked_salary_used = 0
+        locked_games = set()
+        current_cols = []
+
+        # 1. Identify Locked Players and their slots
+        # Hash lookups by ID instead of scanning df_pool for each lineup slot.
+        for i, p_str in enumerate(current_lineup_ids):
+            pid, pos, is_locked = _entry_lock(p_str, self.id_to_pos, self.locked_mask)
+
+            if is_locked:
+                lineup_map[slots[i]] = p_str
+                filled_slots[i] = True
+                locked_ids.add(pid)
+                if pos is not None:
+                    locked_salary_used += self.pool_salary[pos]
+                    locked_games.add(self.pool_games[pos])
+            elif pos is not None:
+                current_cols.append(self.col_of_pos[pos])
+
+        # Fast path: If the lineup is completely locked, return it N times.
+        if filled_slots.all():
+            return [
+                [lineup_map.get(s, "EMPTY") for s in slots] for _ in range(num_to_generate)
+            ]
+
+        # 2. Re-bound the shared model for this base state
+        # A player is live when they fit some open slot and are not already
+        # locked into this entry; every other player column is fixed at 0.
+        open_slots = ~filled_slots
+        locked_codes = [self.id_code[pid] for pid in locked_ids if pid in self.id_code]
+        active = self.eligible[:, open_slots].any(axis=1) & ~np.isin(
+            self.player_id_code, locked_codes
+        )
+        salary_floor = max(0, cfg.min_salary - locked_salary_used)
+        salary_room = cfg.salary_cap - locked_salary_used
+        # Whoever fills one open slot leaves at least the cheapest live salary
+        # for each of the others, so anyone dearer than what remains can never
+        # fit. Fixing them out is exact and trims the model HiGHS presolves.
+        n_open = int(open_slots.sum())
+        if n_open > 1 and active.any():
+            cheapest = self.player_sal[active].min()
+            active &= self.player_sal <= salary_room - (n_open - 1) * cheapest
+
+        # The floor counts only games NOT already covered by locked players; those
+        # are credited via adj_min_games below. Restricting to new games keeps
+        # len(locked_games) + (new games selected) an exact distinct-game count
+        # even for a "mixed" game that holds both a locked player and a draftable
+        # one -- otherwise that single physical game could satisfy the floor twice.
+        live_game = np.where(active, self.player_game, -1)
+        new_players = [
+            np.flatnonzero(live_game == g).astype(np.int32)
+            for g in pd.unique(live_game[live_game >= 0])
+            if self.game_labels[g] not in locked_games and self.game_labels[g] != ""
+        ]
+        adj_min_games = max(0, cfg.min_games - len(locked_games))
+
+        # A single open slot needs no solver: every candidate is one
+        # (player, slot) pair, so the best distinct lineups are simply the
+        # feasible candidates in objective order.
+        if open_slots.sum() == 1:
+            pair_sal = self.player_sal[self.pair_player]
+            feasible = (
+                active[self.pair_player]
+                & open_slots[self.pair_slot]
+                & (pair_sal >= salary_floor)
+                & (pair_sal <= salary_room)
+            )
+            if adj_min_games == 1:
+                in_new_game = np.zeros(self.n_players, dtype=bool)
+                for cols in new_players:
+                    in_new_game[cols] = True
+                feasible &= in_new_game[self.pair_player]
+            elif adj_min_games > 1:
+                feasible[:] = False
+            candidates = np.flatnonzero(feasible)
+            if not len(candidates):
+                print("Warning: Could not optimize lineup for base state. Status: Infeasible")
                 return [current_lineup_ids for _ in range(num_to_generate)]
-            else:
-                while len(generated_lineups) < num_to_generate:
-                    generated_lineups.append(generated_lineups[-1])
-                break
-
-        current_lineup_map = lineup_map.copy()
-        newly_drafted_indices = []
-
-        # Use id_dict and name_dict for result extraction instead of df.loc
-        for i in df_pool.index:
-            if pulp.value(player_vars[i]) > 0.5:
-                if id_dict[i] not in locked_ids:
-                    newly_drafted_indices.append(i)
-                for s in available_slots:
-                    if pulp.value(slot_vars[i][s]) > 0.5:
-                        current_lineup_map[s] = name_dict[i]
-
-        generated_lineups.append([current_lineup_map.get(s, "EMPTY") for s in slots])
-
-        if newly_drafted_indices:
-            prob += pulp.lpSum([player_vars[i] for i in newly_drafted_indices]) <= (
-                len(newly_drafted_indices) - 1
+            ranked = candidates[np.argsort(-self.pair_score[candidates], kind="stable")]
+            open_slot = slots[int(np.flatnonzero(open_slots)[0])]
+            generated_lineups = []
+            for c in ranked[:num_to_generate]:
+                current_lineup_map = lineup_map.copy()
+                current_lineup_map[open_slot] = self.names[self.pair_player[c]]
+                generated_lineups.append([current_lineup_map.get(s, "EMPTY") for s in slots])
+            while len(generated_lineups) < num_to_generate:
+                generated_lineups.append(generated_lineups[-1])
+            return generated_lineups
+
+        # Even the dearest live players cannot reach the salary floor: no
+        # lineup exists, so skip building and running the MILP.
+        live_sal = np.sort(self.player_sal[active])
+        if len(live_sal) < n_open or live_sal[-n_open:].sum() < salary_floor:
+            print("Warning: Could not optimize lineup for base state. Status: Infeasible")
+            return [current_lineup_ids for _ in range(num_to_generate)]
+
+        h = self.highs
+        try:
+            return self._solve_rebounded(
+                h, current_lineup_ids, num_to_generate, lineup_map, open_slots, active,
+                salary_floor, salary_room, new_players, adj_min_games, current_cols,
             )
+        finally:
+            # Drop this base state's game-floor and no-good rows and any
+            # indicator columns so the next one starts from the shared model.
+            n_extra_rows = h.getNumRow() - self.n_base_rows
+            if n_extra_rows:
+                h.deleteRows(
+                    n_extra_rows, np.arange(self.n_base_rows, h.getNumRow(), dtype=np.int32)
+                )
+            n_extra_cols = h.getNumCol() - self.n_players
+            if n_extra_cols:
+                h.deleteCols(
+                    n_extra_cols, np.arange(self.n_players, h.getNumCol(), dtype=np.int32)
+                )
 
-    return generated_lineups
+    def _solve_rebounded(
+        self,
+        h: highspy.Highs,
+        current_lineup_ids: List[str],
+        num_to_generate: int,
+        lineup_map: Dict[str, str],
+        open_slots: np.ndarray,
+        active: np.ndarray,
+        salary_floor: float,
+        salary_room: float,
+        new_players: List[np.ndarray],
+        adj_min_games: int,
+        current_cols: List[int],
+    ) -> List[List[str]]:
+        slots = ROSTER_SLOTS
+        inf = highspy.kHighsInf
+        n = self.n_players
+        n_new_games = len(new_players)
+        n_open = int(open_slots.sum())
+
+        everyone = np.arange(n, dtype=np.int32)
+        h.changeColsBounds(n, everyone, np.zeros(n), active.astype(float))
+        h.changeRowBounds(0, salary_floor, salary_room)
+        h.changeRowBounds(1, n_open, n_open)
+        # A Hall row binds only when its whole slot set is open.
+        n_hall = len(self.hall_sets)
+        binding = ~(self.hall_sets & ~open_slots).any(axis=1)
+        hall_lower = np.where(binding, self.hall_sets.sum(axis=1), -inf)
+        h.changeRowsBounds(
+            n_hall, np.arange(2, 2 + n_hall, dtype=np.int32), hall_lower, np.full(n_hall, inf)
+        )
+
+        # Game-floor rows as (lower, upper, columns, coefficients), added in
+        # one CSR call below.
+        game_rows = []
+        if adj_min_games in (1, 2):
+            # Floors of one or two new games need no indicator columns: at least
+            # one drafted player comes from a new game, and for two, no single
+            # new game may hold all of them -- i.e. for every new game g, some
+            # drafted player comes from a new game other than g.
+            all_new = np.concatenate(new_players) if new_players else np.array([], dtype=np.int32)
+            game_rows.append((1, inf, all_new, np.ones(len(all_new))))
+            if adj_min_games == 2:
+                for players_in_game in new_players:
+                    others = all_new[~np.isin(all_new, players_in_game)]
+                    game_rows.append((1, inf, others, np.ones(len(others))))
+        elif adj_min_games > 2:
+            # General floor: a game indicator can only be 1 when at least one of
+            # its players is drafted; this <= link is what makes the >= floor
+            # binding (a one-directional >= link would leave it non-binding).
+            # The indicators need not be integer: each is capped at 1 and at
+            # the integer count of its game's drafted players, so the sum
+            # still counts distinct games exactly.
+            game_base = n
+            h.addVars(n_new_games, np.zeros(n_new_games), np.ones(n_new_games))
+            for g, players_in_game in enumerate(new_players):
+                cols = np.concatenate([[game_base + g], players_in_game])
+                coefs = np.concatenate([[1.0], -np.ones(len(players_in_game))])
+                game_rows.append((-inf, 0, cols, coefs))
+            cols = game_base + np.arange(n_new_games)
+            game_rows.append((adj_min_games, inf, cols, np.ones(n_new_games)))
+        if game_rows:
+            _add_rows(h, game_rows)
+
+        # Seed the first solve with the better of a greedy fill and the entry's
+        # own unlocked players, which usually form a valid roster already.
+        # HiGHS discards the start if it breaks a row (e.g. min_games), so this
+        # never changes the optimum, only how quickly a good incumbent is found.
+        live = np.flatnonzero(active[self.pair_player] & open_slots[self.pair_slot])
+        open_index = np.cumsum(open_slots) - 1
+        greedy = _greedy_fill(
+            self.pair_player[live], open_index[self.pair_slot[live]], self.pair_score[live],
+            self.player_sal, n_open, salary_room,
+        )
+        starts = [np.unique(current_cols)]
+        if greedy is not None:
+            starts.append(self.pair_player[live[greedy]])
+        starts = [
+            cols for cols in starts
+            if len(cols) == n_open
+            and (cols >= 0).all()
+            and active[cols].all()
+            and salary_floor <= self.player_sal[cols].sum() <= salary_room
+        ]
+        if starts:
+            start = max(starts, key=lambda cols: self.player_score[cols].sum())
+            h.setSolution(len(start), start.astype(np.int32), np.ones(len(start)))
+
+        # 3. Iterative Batch Solving
+        generated_lineups = []
+        open_idx = np.flatnonzero(open_slots)
+
+        for iteration in range(num_to_generate):
+            h.run()
+            status = h.getModelStatus()
+
+            if status != highspy.HighsModelStatus.kOptimal:
+                if iteration == 0:
+                    print(
+                        f"Warning: Could not optimize lineup for base state. Status: {h.modelStatusToString(status)}"
+                    )
+                    return [current_lineup_ids for _ in range(num_to_generate)]
+                else:
+                    while len(generated_lineups) < num_to_generate:
+                        generated_lineups.append(generated_lineups[-1])
+                    break
+
+            values = np.asarray(h.getSolution().col_value)
+            chosen = np.flatnonzero(values[:n] > 0.5)
+            # The Hall rows guarantee a placement exists; assign_slots picks
+            # the one that puts later starters in the flex slots.
+            weights = self.time_scores[chosen, None] * self.flex[open_idx]
+            placed = assign_slots(self.eligible[chosen][:, open_idx], weights)
+            current_lineup_map = lineup_map.copy()
+            current_lineup_map.update(
+                zip([slots[j] for j in open_idx[placed]], self.names[chosen])
+            )
+
+            generated_lineups.append([current_lineup_map.get(s, "EMPTY") for s in slots])
+
+            # Exclude this exact set of new players from the next solve.
+            if len(chosen):
+                h.addRow(-inf, len(chosen) - 1, len(chosen), chosen.astype(np.int32), np.ones(len(chosen)))
+
+        return generated_lineups
+
+
+def solve_late_swap_batch(
+    df_pool: pd.DataFrame,
+    current_lineup_ids: List[str],
+    cfg: Config,
+    num_to_generate: int,
+    eligible: Optional[np.ndarray] = None,
+    time_scores: Optional[np.ndarray] = None,
+    id_lookup: Optional[Tuple[Dict[str, int], np.ndarray]] = None,
+) -> List[List[str]]:
+    """Optimizes the remaining slots of a lineup and generates a batch of unique variations.
+
+    One-off convenience wrapper around ``LateSwapSolver``; ``run`` keeps one
+    solver per worker instead of rebuilding the model for each base state.
+    """
+    solver = LateSwapSolver(df_pool, cfg, eligible, time_scores, id_lookup)
+    return solver.solve(current_lineup_ids, num_to_generate)
+
+
+def _greedy_fill(
+    pair_player: np.ndarray,
+    pair_slot: np.ndarray,
+    pair_score: np.ndarray,
+    sal: np.ndarray,
+    n_open: int,
+    salary_room: float,
+) -> Optional[np.ndarray]:
+    """Greedily fill the open slots from (player, slot) pairs.
+
+    Takes pairs in descending objective order while the slot is empty, the
+    player unused, and the salary fits, keeping enough room for the cheapest
+    player in each slot still open. ``sal`` is indexed by player. Returns the
+    chosen pairs, or None if some slot could not be filled.
+    """
+    cheapest = np.full(n_open, np.inf)
+    np.minimum.at(cheapest, pair_slot, sal[pair_player])
+    slot_filled = np.zeros(n_open, dtype=bool)
+    used_players = set()
+    room = salary_room - cheapest.sum()
+    chosen = []
+    for c in np.argsort(-pair_score, kind="stable"):
+        j, k = pair_slot[c], pair_player[c]
+        if slot_filled[j] or k in used_players:
+            continue
+        extra = sal[k] - cheapest[j]
+        if extra > room:
+            continue
+        room -= extra
+        slot_filled[j] = True
+        used_players.add(k)
+        chosen.append(c)
+        if len(chosen) == n_open:
+            return np.array(chosen)
+    return None
+
+
+def _add_rows(h: highspy.Highs, rows: List[tuple]) -> None:
+    """Add ``(lower, upper, cols, coefs)`` rows in a single CSR ``addRows`` call."""
+    starts = np.cumsum([0] + [len(r[2]) for r in rows[:-1]]).astype(np.int32)
+    h.addRows(
+        len(rows),
+        np.array([r[0] for r in rows], dtype=float),
+        np.array([r[1] for r in rows], dtype=float),
+        int(sum(len(r[2]) for r in rows)),
+        starts,
+        np.concatenate([r[2] for r in rows]).astype(np.int32),
+        np.concatenate([r[3] for r in rows]).astype(float),
+    )
+
+
+# --- WORKER FUNCTIONS (MUST BE TOP-LEVEL) ---
+_SWAP_SOLVER: Optional[LateSwapSolver] = None
+
+
+def _init_swap_worker(
+    df_pool: pd.DataFrame, cfg: Config, eligible: np.ndarray, time_scores: np.ndarray,
+    id_lookup: Tuple[Dict[str, int], np.ndarray],
+) -> None:
+    """ProcessPoolExecutor initializer: build this worker's solver once."""
+    global _SWAP_SOLVER
+    _SWAP_SOLVER = LateSwapSolver(df_pool, cfg, eligible, time_scores, id_lookup)
+
+
+def _solve_base_state(template_players: List[str], num_to_generate: int) -> List[List[str]]:
+    """Solve one base state against this worker's solver."""
+    return _SWAP_SOLVER.solve(template_players, num_to_generate)
 
 
 def run(cfg: Config):
@@ -281,22 +621,19 @@ def run(cfg: Config):
         projs_file = get_latest_file(cfg.projs_dir, "NBA-Projs-*.csv")
         print(f"Using projections: {os.path.basename(projs_file)}")
 
-        df_entries, entry_cols = read_ragged_csv(cfg.entries_path)
+        # One read of DKEntries feeds both the entries table and the pool.
+        entries_text = read_text(cfg.entries_path)
+        df_entries, entry_cols = read_ragged_csv(cfg.entries_path, text=entries_text)
 
         valid_mask = df_entries[entry_cols[0]].notna()
         valid_entries = df_entries[valid_mask]
 
-        current_ids = set()
         slots = ROSTER_SLOTS
-        for _, row in valid_entries.iterrows():
-            for s in slots:
-                val = row.get(s)
-                if pd.notna(val):
-                    pid = extract_player_id(val)
-                    if pid:
-                        current_ids.add(pid)
+        cells = valid_entries.reindex(columns=slots).to_numpy(dtype=object)
+        entry_ids, marked_locked = entry_player_arrays(cells)
+        current_ids = set(entry_ids[pd.notna(entry_ids)])
 
-        df_pool = load_data(projs_file, cfg.entries_path)
+        df_pool = load_data(projs_file, cfg.entries_path, entries_text)
 
         mask_proj = df_pool["Projection"] >= cfg.min_projection
         mask_current = df_pool["ID"].isin(current_ids)
@@ -304,61 +641,77 @@ def run(cfg: Config):
         df_pool.reset_index(drop=True, inplace=True)
 
         print(f"Player Pool Loaded: {len(df_pool)} players.")
+        eligible, time_scores = pool_swap_arrays(df_pool)
+        id_to_pos, locked_mask = pool_id_lookup(df_pool)
         print(f"Found {len(valid_entries)} valid entries.")
 
+        # A cell is locked when its entry string carries the marker or its
+        # player is flagged locked in the pool (the same rule as
+        # _entry_lock), resolved for every entry and slot at once.
+        pool_pos = np.array(
+            [id_to_pos.get(pid, -1) for pid in entry_ids.ravel()], dtype=int
+        ).reshape(entry_ids.shape)
+        pool_locked = np.append(locked_mask, False)[pool_pos]
+        cell_locked = pd.notna(entry_ids) & (marked_locked | pool_locked)
+        complete = pd.notna(cells).all(axis=1)
+
         base_states = {}
-        for idx, row in valid_entries.iterrows():
-            current_players = [row[s] for s in slots if s in row and pd.notna(row[s])]
-            if len(current_players) < len(slots):
+        fully_locked = 0
+        for r, idx in enumerate(valid_entries.index):
+            if not complete[r]:
                 print(
-                    f"Warning: Entry {row[entry_cols[0]]} has an incomplete lineup. Skipping."
+                    f"Warning: Entry {valid_entries[entry_cols[0]].iat[r]} has an incomplete lineup. Skipping."
                 )
                 continue
 
-            locked_signature = []
-            for i, p_str in enumerate(current_players):
-                pid = extract_player_id(p_str)
-                is_locked = is_player_locked(p_str)
-                if not is_locked and pid:
-                    player_data = df_pool[df_pool["ID"] == pid]
-                    if not player_data.empty and is_player_locked(
-                        player_data.iloc[0].get("Name + ID", "")
-                    ):
-                        is_locked = True
-
-                if is_locked and pid:
-                    locked_signature.append((slots[i], pid))
-
-            base_state_key = tuple(locked_signature)
+            # A fully locked entry has nothing to swap; leave it as it is
+            # rather than sending it to a worker.
+            if cell_locked[r].all():
+                fully_locked += 1
+                continue
+
+            base_state_key = tuple(
+                (slots[j], entry_ids[r, j]) for j in np.flatnonzero(cell_locked[r])
+            )
             if base_state_key not in base_states:
                 base_states[base_state_key] = []
-            base_states[base_state_key].append((idx, current_players))
+            base_states[base_state_key].append((idx, list(cells[r])))
 
+        if fully_locked:
+            print(f"Skipped {fully_locked} fully locked entries.")
         print(
             f"Grouped entries into {len(base_states)} unique base states for batch processing."
         )
 
+        # Base states are independent solves; fan them out across cores. The
+        # pool and its precomputed arrays go to each worker once through the
+        # initializer, so a task carries only its template lineup.
+        updated_index = []
         new_lineups = []
-        for i, (base_state_key, entries) in enumerate(base_states.items()):
-            num_to_generate = len(entries)
-            template_players = entries[0][1]
-
-            batch_lineups = solve_late_swap_batch(
-                df_pool, template_players, cfg, num_to_generate
-            )
-
-            for j, (idx, _) in enumerate(entries):
-                entry_update = {s: batch_lineups[j][k] for k, s in enumerate(slots)}
-                entry_update["index"] = idx
-                new_lineups.append(entry_update)
-
-            if (i + 1) % max(1, (len(base_states) // 10)) == 0:
-                print(f"Processed {i + 1}/{len(base_states)} base states...")
-
-        for update in new_lineups:
-            idx = update.pop("index")
-            for s, player in update.items():
-                df_entries.at[idx, s] = player
+        report_every = max(1, (len(base_states) // 10))
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max(1, min(multiprocessing.cpu_count(), len(base_states))),
+            initializer=_init_swap_worker,
+            initargs=(df_pool, cfg, eligible, time_scores, (id_to_pos, locked_mask)),
+        ) as executor:
+            futures = {
+                executor.submit(_solve_base_state, entries[0][1], len(entries)): entries
+                for entries in base_states.values()
+            }
+            for i, future in enumerate(concurrent.futures.as_completed(futures)):
+                batch_lineups = future.result()
+
+                for j, (idx, _) in enumerate(futures[future]):
+                    updated_index.append(idx)
+                    new_lineups.append(batch_lineups[j])
+
+                if (i + 1) % report_every == 0:
+                    print(f"Processed {i + 1}/{len(base_states)} base states...")
+
+        # Write every updated roster back in one block assignment rather than
+        # one scalar .at call per (entry, slot).
+        if new_lineups:
+            df_entries.loc[updated_index, slots] = np.array(new_lineups, dtype=object)
 
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
         output_file = os.path.join(
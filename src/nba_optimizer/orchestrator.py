@@ -25,7 +25,9 @@ def run_pipeline(args):
         return
 
     print("\n--- Phase 1: Generating Lineups ---")
-    lineup_pool_file = engine.run(
+    # Each stage writes its CSV and also returns the frame, which is handed
+    # to the next stage directly instead of being re-read from disk.
+    lineup_pool_file, df_lineups = engine.run(
         config,
         num_lineups=args.num_lineups,
         randomness=args.randomness,
@@ -36,12 +38,13 @@ def run_pipeline(args):
         return
 
     print("\n--- Phase 2: Ranking Lineups ---")
-    ranked_file = ranker.run(
+    ranked_file, df_ranked = ranker.run(
         config,
         proj_weight=args.proj_weight,
         own_weight=args.own_weight,
         geo_weight=args.geo_weight,
         lineup_file=lineup_pool_file,
+        df_lineups=df_lineups,
     )
     if not ranked_file:
         print("Error: Lineup ranking failed. Aborting pipeline.")
@@ -51,6 +54,7 @@ def run_pipeline(args):
     export_file = exporter.run(
         config,
         ranked_file=ranked_file,
+        df_ranked=df_ranked,
     )
     if not export_file:
         print("Error: Export failed. Aborting pipeline.")
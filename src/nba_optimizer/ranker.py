@@ -2,53 +2,80 @@ import argparse
 import os
 import traceback
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from .config import Config, ROSTER_SLOTS
-from .utils import get_latest_file, merge_player_pool, parse_dk_entries
+from .utils import (
+    get_latest_file,
+    load_projections,
+    merge_player_pool,
+    parse_dk_entries,
+)
 
 
 def load_data(lineup_file: str, projs_file: str, cfg: Config) -> tuple[pd.DataFrame, pd.DataFrame]:
     """Loads lineups and player data (projections/ownership)."""
     df_lineups = pd.read_csv(lineup_file)
-    df_projs = pd.read_csv(projs_file)
+    return df_lineups, load_players(projs_file, cfg)
+
+
+def load_players(projs_file: str, cfg: Config) -> pd.DataFrame:
+    """Loads player data (projections/ownership) merged onto the DK pool."""
+    df_projs = load_projections(projs_file)
     df_players = parse_dk_entries(cfg.entries_path)
-    df_merged = merge_player_pool(df_players, df_projs, how="inner", derive_time_game=True)
-    return df_lineups, df_merged
+    return merge_player_pool(df_players, df_projs, how="inner", derive_time_game=True)
+
+
+def score_lineups(
+    codes: np.ndarray, proj_arr: np.ndarray, own_arr: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Total projection, total ownership and geomean ownership per lineup.
+
+    ``codes`` is an (L, 8) array of player indices into ``proj_arr`` and
+    ``own_arr``; each reduction runs over the whole lineup matrix at once.
+    """
+    proj = proj_arr[codes]
+    own = own_arr[codes]
+    # Geomean Ownership (floor at 0.1 to avoid log(0); fmax also floors a
+    # blank ownership instead of passing NaN through)
+    geo_own = np.exp(np.log(np.fmax(own, 0.1)).mean(axis=1))
+    return _sum_columns(proj), _sum_columns(own), geo_own
+
+
+def _sum_columns(values: np.ndarray) -> np.ndarray:
+    """Row sums added slot by slot, left to right, so totals (and therefore
+    rank ties) match a plain Python ``sum`` over the lineup."""
+    total = values[:, 0].copy()
+    for k in range(1, values.shape[1]):
+        total += values[:, k]
+    return total
 
 
 def rank_lineups(
     df_lineups: pd.DataFrame, df_players: pd.DataFrame, weights: Dict[str, float]
 ):
     """Calculates metrics and ranks lineups based on weighted scores."""
-    proj_map = df_players.set_index("Name + ID")["Projection"].to_dict()
-    own_map = df_players.set_index("Name + ID")["Own_Proj"].to_dict()
-
-    lineup_results = []
-    slots = ROSTER_SLOTS
-
-    for idx, row in df_lineups.iterrows():
-        lineup_names = [row[s] for s in slots]
-
-        total_proj = sum([proj_map.get(name, 0) for name in lineup_names])
-        total_own = sum([own_map.get(name, 0) for name in lineup_names])
-
-        # Geomean Ownership (add small epsilon to avoid log(0))
-        own_values = [own_map.get(name, 0) for name in lineup_names]
-        geo_own = np.exp(np.mean(np.log([max(0.1, o) for o in own_values])))
-
-        lineup_results.append(
-            {
-                "Lineup_ID": idx + 1,
-                "Total_Projection": total_proj,
-                "Total_Ownership": total_own,
-                "Geomean_Ownership": geo_own,
-                **{s: row[s] for s in slots},
-            }
-        )
+    slots = list(ROSTER_SLOTS)
+    # Encode every slot cell as a dense player index once; a name missing
+    # from the pool gets the extra trailing index, which scores 0.
+    players = df_players.drop_duplicates("Name + ID", keep="last").set_index("Name + ID")
+    names = df_lineups[slots].to_numpy()
+    codes = players.index.get_indexer(names.ravel()).reshape(names.shape)
+    codes[codes < 0] = len(players)
+    proj_arr = np.append(players["Projection"].to_numpy(dtype=float), 0.0)
+    own_arr = np.append(players["Own_Proj"].to_numpy(dtype=float), 0.0)
+    total_proj, total_own, geo_own = score_lineups(codes, proj_arr, own_arr)
+
+    lineup_results = {
+        "Lineup_ID": df_lineups.index.to_numpy() + 1,
+        "Total_Projection": total_proj,
+        "Total_Ownership": total_own,
+        "Geomean_Ownership": geo_own,
+        **{s: names[:, k] for k, s in enumerate(slots)},
+    }
 
     df_res = pd.DataFrame(lineup_results)
 
@@ -78,7 +105,8 @@ def run(
     geo_weight: float = 0.15,
     lineup_file: Optional[str] = None,
     projs_file: Optional[str] = None,
-) -> str:
+    df_lineups: Optional[pd.DataFrame] = None,
+) -> Tuple[str, Optional[pd.DataFrame]]:
     """Rank the lineup pool.
 
     Args:
@@ -91,26 +119,33 @@ def run(
             fallback behaviour).
         projs_file: Explicit path to a projections CSV. When omitted,
             the most recent file in ``cfg.projs_dir`` is used.
+        df_lineups: The lineup pool already in memory (as returned by
+            ``engine.run``). When given, it is ranked instead of reading
+            ``lineup_file``.
 
     Returns:
-        Path to the written ranked-lineups CSV, or an empty string if the run
-        failed before producing output.
+        Path to the written ranked-lineups CSV and the ranked lineups as
+        written, or ``("", None)`` if the run failed before producing output.
     """
     print("Starting NBA DFS Sorter & Ranker...")
 
     try:
         # 1. Identify files — use explicit paths when provided, otherwise fall back
         #    to latest-file discovery (standalone / direct module invocation).
-        if not lineup_file:
+        if not lineup_file and df_lineups is None:
             lineup_file = get_latest_file(cfg.lineup_pool_dir, "lineup-pool-*.csv")
         if not projs_file:
             projs_file = get_latest_file(cfg.projs_dir, "NBA-Projs-*.csv")
 
-        print(f"Ranking: {os.path.basename(lineup_file)}")
+        if lineup_file:
+            print(f"Ranking: {os.path.basename(lineup_file)}")
         print(f"Using metrics from: {os.path.basename(projs_file)}")
 
         # 2. Load and merge
-        df_lineups, df_players = load_data(lineup_file, projs_file, cfg)
+        if df_lineups is None:
+            df_lineups, df_players = load_data(lineup_file, projs_file, cfg)
+        else:
+            df_players = load_players(projs_file, cfg)
 
         # 3. Rank
         weights = {
@@ -140,15 +175,16 @@ def run(
             "Geo_Rank",
         ] + list(ROSTER_SLOTS)
 
-        df_ranked[cols].to_csv(output_file, index=False)
+        df_out = df_ranked[cols].reset_index(drop=True)
+        df_out.to_csv(output_file, index=False)
         print(f"Successfully ranked {len(df_ranked)} lineups.")
         print(f"Saved to: {output_file}")
-        return output_file
+        return output_file, df_out
 
     except Exception as e:
         print(f"Error: {e}")
         traceback.print_exc()
-        return ""
+        return "", None
 
 
 def main():
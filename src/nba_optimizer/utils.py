@@ -1,12 +1,26 @@
+import fnmatch
+import functools
 import io
 import os
-import glob
 import re
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Tuple, List, Optional
+from typing import Callable, Tuple, List, Optional
+
+from .config import PLAYER_POOL_COLS, PROJECTION_COLS, ROSTER_SLOTS
+
+# Start time embedded in DK "Game Info", e.g. "MIA@PHI 02/25/2026 07:00PM ET".
+_GAME_TIME_PATTERN = r"(\d{2}/\d{2}/\d{4} \d{2}:\d{2}[AP]M)"
+_GAME_TIME_FORMAT = "%m/%d/%Y %I:%M%p"
+# Compiled once: these run per player string across entries and slots.
+_GAME_TIME_RE = re.compile(_GAME_TIME_PATTERN)
+_PLAYER_ID_RE = re.compile(r"\((\d+)\)")
+_LOCKED_RE = re.compile(r"\(LOCKED\)", re.IGNORECASE)
+_MATCHUP_RE = re.compile(r"\s*([A-Za-z]{2,4})@([A-Za-z]{2,4})")
+
 
 
 def get_latest_file(directory: str, pattern: str, use_mtime: bool = False) -> str:
@@ -14,14 +28,25 @@ def get_latest_file(directory: str, pattern: str, use_mtime: bool = False) -> st
     Finds the most recent file matching a pattern in a directory.
     Replaces redundant implementations in ranker.py, exporter.py, engine.py, etc.
     """
-    files = glob.glob(os.path.join(directory, pattern))
-    if not files:
+    # One scandir pass keeps only the running best match; glob would build
+    # the full list first. Hidden files are skipped, as glob does.
+    best, best_key = None, None
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not fnmatch.fnmatch(entry.name, pattern):
+                    continue
+                # exposure_report.py uses mtime, while others rely on alphabetical
+                # timestamp ordering of the file names.
+                key = entry.stat().st_mtime if use_mtime else entry.name
+                if best is None or key > best_key:
+                    best, best_key = entry.path, key
+    except OSError:
+        # A missing or non-directory path simply has no matches, as with glob.
+        pass
+    if best is None:
         raise FileNotFoundError(f"No files matching '{pattern}' found in {directory}")
-
-    # exposure_report.py uses getmtime, while others rely on alphabetical timestamp sorting via basename
-    if use_mtime:
-        return max(files, key=os.path.getmtime)
-    return max(files, key=os.path.basename)
+    return best
 
 
 def extract_player_id(player_string: str) -> Optional[str]:
@@ -31,17 +56,37 @@ def extract_player_id(player_string: str) -> Optional[str]:
     """
     if pd.isna(player_string):
         return None
-    match = re.search(r"\((\d+)\)", str(player_string))
+    match = _PLAYER_ID_RE.search(str(player_string))
     return match.group(1) if match else None
 
 
+def player_ids(player_strings: pd.Series) -> np.ndarray:
+    """Vectorized ``extract_player_id`` over a column of player strings.
+
+    Returns an object array holding the ID string, or None where a value
+    is missing or has no ID.
+    """
+    ids = player_strings.astype("string").str.extract(_PLAYER_ID_RE, expand=False)
+    return ids.astype(object).where(ids.notna(), None).to_numpy()
+
+
 def is_player_locked(player_string: str) -> bool:
     """
     Determines if a player string contains the (LOCKED) indicator.
     """
     if pd.isna(player_string):
         return False
-    return "(LOCKED)" in str(player_string).upper()
+    return _LOCKED_RE.search(str(player_string)) is not None
+
+
+def locked_flags(player_strings: pd.Series) -> np.ndarray:
+    """Vectorized ``is_player_locked`` over a column of player strings.
+
+    Runs the same compiled pattern through one ``str.contains`` pass;
+    missing values are not locked.
+    """
+    marked = player_strings.astype("string").str.contains(_LOCKED_RE)
+    return marked.fillna(False).to_numpy(dtype=bool)
 
 
 def parse_game_time(game_info: str) -> datetime:
@@ -49,15 +94,97 @@ def parse_game_time(game_info: str) -> datetime:
     Extracts datetime from a DraftKings game info string (e.g., "MIA@PHI 02/25/2026 07:00PM ET").
     Unifies the time parsing logic found in engine.py and late_swapper_v1.1.py.
     """
-    match = re.search(r"(\d{2}/\d{2}/\d{4} \d{2}:\d{2}[AP]M)", str(game_info))
+    match = _GAME_TIME_RE.search(str(game_info))
     if not match:
         return datetime.max  # Fallback to push invalid times to the end
     try:
-        return datetime.strptime(match.group(1), "%m/%d/%Y %I:%M%p")
+        return datetime.strptime(match.group(1), _GAME_TIME_FORMAT)
     except ValueError:
         return datetime.max
 
 
+def parse_game_times(game_info: pd.Series) -> pd.Series:
+    """Vectorized ``parse_game_time`` over a whole "Game Info" column.
+
+    Extracts and parses every start time in one pass instead of calling
+    ``re.search`` and ``strptime`` per row. Unparseable entries become
+    ``NaT`` (``datetime.max`` does not fit a datetime64 column).
+    """
+    extracted = game_info.astype(str).str.extract(_GAME_TIME_PATTERN, expand=False)
+    return pd.to_datetime(extracted, format=_GAME_TIME_FORMAT, errors="coerce")
+
+
+def slot_eligibility_matrix(roster_positions: pd.Series) -> np.ndarray:
+    """Return an (N, len(ROSTER_SLOTS)) boolean matrix of DK slot eligibility.
+
+    Column order follows ``ROSTER_SLOTS``. G accepts PG/SG, F accepts SF/PF,
+    and UTIL accepts everyone. The string tests run once per distinct roster
+    position (a handful per slate, and free for a categorical column) and are
+    then broadcast to players by their factorized codes.
+    """
+    codes, uniques = pd.factorize(roster_positions)
+    pos = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+    # Extra trailing row for missing positions: factorize codes them as -1.
+    base = {
+        p: np.append(pos.str.contains(p, regex=False).to_numpy(), False)[codes]
+        for p in ("PG", "SG", "SF", "PF", "C")
+    }
+    cols = []
+    for s in ROSTER_SLOTS:
+        if s == "UTIL":
+            cols.append(np.ones(len(codes), dtype=bool))
+        elif s == "G":
+            cols.append(base["PG"] | base["SG"])
+        elif s == "F":
+            cols.append(base["SF"] | base["PF"])
+        else:
+            cols.append(base[s])
+    return np.column_stack(cols)
+
+
+def assign_slots(eligible: np.ndarray, weights: np.ndarray) -> Optional[List[int]]:
+    """Assign each player (row) to a distinct slot (column), maximizing weight.
+
+    Exact dynamic program over the bitmask of already-used slots, which is
+    trivial for an 8-slot roster (at most 2^8 states per player) and avoids
+    a solver round-trip for what is a tiny bipartite assignment.
+
+    Args:
+        eligible: (n_players, n_slots) boolean eligibility matrix.
+        weights: (n_players, n_slots) score for placing a player in a slot.
+
+    Returns:
+        The chosen slot column index for each player, in row order, or
+        ``None`` if the players cannot all be placed in distinct eligible slots.
+    """
+    n_slots = eligible.shape[1]
+    # Each player's eligible slots as a bitmask (bit s = column s), so the
+    # free slots for a state are one AND instead of a scan over all slots.
+    elig_bits = (eligible.astype(np.int64) << np.arange(n_slots)).sum(axis=1).tolist()
+    w = np.asarray(weights, dtype=float).tolist()
+
+    # best[mask] = (score, picks) for the players placed so far using `mask`
+    best = {0: (0.0, ())}
+    for k, bits in enumerate(elig_bits):
+        wk = w[k]
+        nxt = {}
+        for mask, (score, picks) in best.items():
+            free = bits & ~mask
+            while free:
+                bit = free & -free
+                free ^= bit
+                s = bit.bit_length() - 1
+                cand = score + wk[s]
+                prev = nxt.get(mask | bit)
+                if prev is None or cand > prev[0]:
+                    nxt[mask | bit] = (cand, picks + (s,))
+        if not nxt:
+            return None
+        best = nxt
+
+    return list(max(best.values(), key=lambda v: v[0])[1])
+
+
 def derive_game_key(team, opponent, game_info: str = "") -> str:
     """Return a canonical, order-independent game identifier (e.g. "ATL@DET").
 
@@ -76,7 +203,7 @@ def derive_game_key(team, opponent, game_info: str = "") -> str:
         return "@".join(sorted([ta, opp]))
 
     gi = "" if pd.isna(game_info) else str(game_info).strip()
-    match = re.match(r"\s*([A-Za-z]{2,4})@([A-Za-z]{2,4})", gi)
+    match = _MATCHUP_RE.match(gi)
     if match:
         return "@".join(sorted([match.group(1).upper(), match.group(2).upper()]))
 
@@ -88,33 +215,102 @@ def derive_game_key(team, opponent, game_info: str = "") -> str:
 
 
 def read_ragged_csv(
-    file_path: str, max_columns: int = 25
+    file_path: str, max_columns: int = 25, text: Optional[str] = None
 ) -> Tuple[pd.DataFrame, List[str]]:
     """
     Safely reads a CSV with ragged rows (like the DKEntries template) by padding with dummy columns.
+    Pads to ``max_columns`` columns, or more if a line is wider.
     Extracts the robust parsing logic previously localized in exporter.py and late_swapper_v1.1.py.
+    Pass ``text`` (from ``read_text``) to parse an already-read file.
 
     Returns:
         Tuple containing the padded DataFrame and a list of the valid (original) column names.
     """
-    header_df = pd.read_csv(file_path, nrows=0)
-    valid_cols = header_df.columns.tolist()
-
-    extra_count = max(0, max_columns - len(valid_cols))
+    # Read the file once; the header row and the body are parsed from the
+    # same text instead of opening and tokenizing the file twice.
+    if text is None:
+        text = read_text(file_path)
+    header_end = text.find("\n")
+    header_line = text if header_end == -1 else text[:header_end]
+    valid_cols = pd.read_csv(io.StringIO(header_line), nrows=0).columns.tolist()
+
+    # Pad to at least the widest line (comma count is an upper bound on its
+    # fields), so no row ever has more fields than names and none has to
+    # be skipped as a bad line.
+    widest = max(line.count(",") for line in text.split("\n")) + 1
+    extra_count = max(0, max(max_columns, widest) - len(valid_cols))
     all_cols = valid_cols + [f"extra_{i}" for i in range(extra_count)]
 
     df = pd.read_csv(
-        file_path,
+        io.StringIO(text),
         header=None,
         names=all_cols,
         skiprows=1,
         dtype={"Entry ID": object, "Contest ID": object},
-        engine="python",
+        # The padded names cover every field, so the C parser can read
+        # the ragged rows without falling back to the slow python engine.
+        engine="c",
+        low_memory=False,
     )
     return df, valid_cols
 
 
-def parse_dk_entries(entries_file: str) -> pd.DataFrame:
+def normalize_player_ids(ids: pd.Series) -> pd.Series:
+    """Return IDs as plain integer strings, e.g. 12345.0 -> "12345".
+
+    Both CSV readers already load ID as a string, so usually no value has a
+    decimal part; only the rows that do are split, instead of splitting and
+    re-joining the whole column.
+    """
+    ids = ids.astype(str)
+    has_decimal = ids.str.contains(".", regex=False)
+    if has_decimal.any():
+        ids = ids.mask(has_decimal, ids[has_decimal].str.split(".", n=1).str[0])
+    return ids
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def read_text(path: str) -> str:
+    """Read a whole text export (BOM-tolerant).
+
+    The DKEntries export is parsed both as the ragged entries table and for
+    its player-pool section; a caller that needs both reads it once with
+    this and passes the text to ``read_ragged_csv`` and ``parse_dk_entries``.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_once(
+    reader: Callable[[str], pd.DataFrame], path: str, stamp: Tuple[int, int]
+) -> pd.DataFrame:
+    return reader(path)
+
+
+def _read_cached(path: str, reader: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+    """Return a copy of ``reader(path)``, re-parsing only if the file changed.
+
+    A full pipeline run reads the same DKEntries and projections files in
+    the engine, ranker, exposure report and late swapper; this parses each
+    once per process. The cache is keyed on the file's (mtime_ns, size)
+    stamp and holds only the few most recent parses, so an edited file is
+    re-read and old slates are evicted. Callers get a copy they are free to
+    mutate.
+    """
+    return _parse_once(reader, os.path.abspath(path), _file_stamp(path)).copy()
+
+
+def clear_file_caches() -> None:
+    """Drop every cached file read and parse; the next load goes to disk."""
+    _parse_once.cache_clear()
+
+
+def parse_dk_entries(entries_file: str, text: Optional[str] = None) -> pd.DataFrame:
     """Parse the DKEntries CSV player-pool section into a DataFrame.
 
     Searches for the header row containing "Position,Name + ID,Name,ID"
@@ -124,26 +320,53 @@ def parse_dk_entries(entries_file: str) -> pd.DataFrame:
     use the same player-pool section format.
 
     Returns a DataFrame with ID normalized to a plain integer string and
-    rows with a missing ID dropped.
+    rows with a missing ID dropped. Pass ``text`` (from ``read_text``) to
+    parse an already-read file instead of loading it through the cache.
     """
-    with open(entries_file, "r", encoding="utf-8-sig") as f:
-        lines = f.readlines()
+    if text is not None:
+        return _parse_dk_text(text, entries_file)
+    return _read_cached(entries_file, _parse_dk_entries)
+
 
-    pool_start = -1
-    for i, line in enumerate(lines):
-        if "Position,Name + ID,Name,ID" in line:
-            pool_start = i
-            break
+def _parse_dk_entries(entries_file: str) -> pd.DataFrame:
+    return _parse_dk_text(read_text(entries_file), entries_file)
 
-    if pool_start == -1:
+
+def _parse_dk_text(text: str, entries_file: str) -> pd.DataFrame:
+
+    # Slice from the start of the first line holding the pool header rather
+    # than splitting the whole file into lines and re-joining the tail.
+    marker = text.find("Position,Name + ID,Name,ID")
+    if marker == -1:
         raise ValueError(f"Could not find player pool section in {entries_file}")
+    pool_start = text.rfind("\n", 0, marker) + 1
 
-    df_players = pd.read_csv(io.StringIO("".join(lines[pool_start:])))
+    df_players = pd.read_csv(
+        io.StringIO(text[pool_start:]),
+        usecols=lambda c: c in PLAYER_POOL_COLS,
+        dtype={"ID": str},
+    )
     df_players = df_players.dropna(subset=["ID"]).copy()
-    df_players["ID"] = df_players["ID"].astype(str).str.split(".").str[0]
+    df_players["ID"] = normalize_player_ids(df_players["ID"])
     return df_players
 
 
+def load_projections(projs_file: str) -> pd.DataFrame:
+    """Read the projections CSV, keeping only the columns the pipeline uses.
+
+    ``ID`` is read as a string so it matches the DKEntries IDs without a
+    float round-trip; any projections columns outside ``PROJECTION_COLS``
+    are skipped by the parser.
+    """
+    return _read_cached(projs_file, _read_projections)
+
+
+def _read_projections(projs_file: str) -> pd.DataFrame:
+    return pd.read_csv(
+        projs_file, usecols=lambda c: c in PROJECTION_COLS, dtype={"ID": str}
+    )
+
+
 def merge_player_pool(
     df_players: pd.DataFrame, df_projs: pd.DataFrame, how: Literal["inner", "left"],
     derive_time_game: bool = False,
@@ -157,7 +380,7 @@ def merge_player_pool(
 
     Args:
         df_players: Output of ``parse_dk_entries``.
-        df_projs: Raw projections CSV loaded via ``pd.read_csv``.
+        df_projs: Projections DataFrame loaded via ``load_projections``.
         how: ``"inner"`` for engine/ranker (only projected players) or
             ``"left"`` for late-swap (all pool players; a player missing
             from projections is a data error and will raise).
@@ -179,7 +402,7 @@ def merge_player_pool(
     # Normalize projs ID the same way as parse_dk_entries: if any ID is NaN,
     # pandas reads the column as float64 and astype(str) would give "12345.0",
     # which would silently fail to match the "12345" IDs from parse_dk_entries.
-    df_projs["ID"] = df_projs["ID"].astype(str).str.split(".").str[0]
+    df_projs["ID"] = normalize_player_ids(df_projs["ID"])
     df_merged = pd.merge(df_players, df_projs, on="ID", how=how)
     df_merged["Salary"] = pd.to_numeric(df_merged["Salary"])
     if "Projection" in df_merged.columns:
@@ -194,6 +417,10 @@ def merge_player_pool(
             raise ValueError(
                 "Cannot derive StartTime/Game: 'Game Info' column missing from merged pool"
             )
-        df_merged["StartTime"] = df_merged["Game Info"].apply(parse_game_time)
-        df_merged["Game"] = df_merged["Game Info"].str.split(" ").str[0]
+        # A slate has only a dozen or so distinct Game Info strings, so parse
+        # those once and broadcast to players by their factorized codes.
+        codes, uniques = pd.factorize(df_merged["Game Info"])
+        info = pd.Series(np.append(np.asarray(uniques, dtype=object), None))
+        df_merged["StartTime"] = parse_game_times(info).to_numpy()[codes]
+        df_merged["Game"] = info.str.split(" ", n=1).str[0].to_numpy()[codes]
     return df_merged
@@ -10,10 +10,20 @@ because including either of them breaks the salary-floor or roster-size
 constraint.
 """
 
+import numpy as np
 import pandas as pd
 
+from nba_optimizer import engine
 from nba_optimizer.config import ROSTER_SLOTS, Config
-from nba_optimizer.engine import generate_single_lineup
+from nba_optimizer.engine import (
+    LineupSolver,
+    dp_workspace,
+    filter_unique_lineups,
+    generate_single_lineup,
+    select_lineup_dp,
+    slot_lineup_by_time,
+)
+from nba_optimizer.utils import assign_slots, slot_eligibility_matrix
 
 
 def _build_pool() -> pd.DataFrame:
@@ -186,3 +196,181 @@ def test_min_games_is_enforced_against_single_game_optimum():
 
     df_selected = df_pool.loc[list(selected_indices)]
     assert df_selected["Game"].nunique() >= cfg.min_games
+
+
+def test_selection_is_always_slottable_when_one_player_covers_two_slots():
+    """A lone PF/C satisfies "at least one PF" and "at least one C" on its own
+    but can only fill one of those slots. The positional rows must still force
+    a selection that fills every DK slot, even though the highest-projection
+    eight players (five guards, two SFs, the PF/C) cannot."""
+    data = [(f"G{k} ({k})", 6200, "PG" if k < 3 else "SG", 45, "GAMEA") for k in range(5)]
+    data += [
+        ("SF1 (5)", 6200, "SF", 45, "GAMEB"),
+        ("SF2 (6)", 6200, "SF", 45, "GAMEB"),
+        ("PFC (7)", 6200, "PF/C", 45, "GAMEB"),
+        ("PF1 (8)", 6200, "PF", 20, "GAMEB"),
+        ("C1 (9)", 6200, "C", 20, "GAMEB"),
+    ]
+    df_pool = pd.DataFrame(
+        data, columns=["Name + ID", "Salary", "Roster Position", "Projection", "Game"]
+    )
+    cfg = Config()
+
+    lineup_names, selected_indices = generate_single_lineup(
+        df_pool,
+        randomness=0.0,
+        min_salary=cfg.min_salary,
+        salary_cap=cfg.salary_cap,
+        roster_size=cfg.roster_size,
+        min_games=cfg.min_games,
+    )
+
+    assert lineup_names is not None, "expected a feasible lineup for this pool"
+    df_selected = df_pool.loc[sorted(selected_indices)]
+    eligible = slot_eligibility_matrix(df_selected["Roster Position"])
+    assert assign_slots(eligible, np.zeros(eligible.shape)) is not None
+
+
+def test_dp_selection_matches_highs_optimum():
+    """The opt-in DP fast path finds a lineup as good as the HiGHS MILP on
+    random DK-shaped pools."""
+    rng = np.random.default_rng(7)
+    positions = ["PG", "SG", "SF", "PF", "C", "PG/SG", "SG/SF", "SF/PF", "PF/C"]
+    n = 60
+    df_pool = pd.DataFrame({
+        "Name + ID": [f"P{k} ({k})" for k in range(n)],
+        "Salary": rng.integers(30, 110, n) * 100,
+        "Roster Position": rng.choice(positions, n),
+        "Projection": rng.uniform(10, 55, n),
+        "Game": rng.choice(["GAMEA", "GAMEB", "GAMEC"], n),
+    })
+    cfg = Config()
+
+    for _ in range(5):
+        df_pool["Projection"] = rng.uniform(10, 55, n)
+        solver = LineupSolver(
+            df_pool, cfg.min_salary, cfg.salary_cap, cfg.roster_size, cfg.min_games, use_dp=True
+        )
+        assert solver.use_dp
+        _, dp_indices = solver.solve(0.0)
+        solver.use_dp = False
+        _, lp_indices = solver.solve(0.0)
+
+        dp_total = df_pool.loc[list(dp_indices), "Projection"].sum()
+        lp_total = df_pool.loc[list(lp_indices), "Projection"].sum()
+        assert abs(dp_total - lp_total) < 1e-3
+        assert df_pool.loc[list(dp_indices), "Salary"].sum() <= cfg.salary_cap
+
+
+def test_dp_workspace_reuse_matches_fresh_buffers():
+    """Solving many objectives on one solver's reused DP buffers picks the same
+    lineups as solving each with freshly allocated buffers."""
+    rng = np.random.default_rng(11)
+    positions = ["PG", "SG", "SF", "PF", "C", "PG/SG", "SG/SF", "SF/PF", "PF/C"]
+    n = 40
+    df_pool = pd.DataFrame({
+        "Name + ID": [f"P{k} ({k})" for k in range(n)],
+        "Salary": rng.integers(30, 110, n) * 100,
+        "Roster Position": rng.choice(positions, n),
+        "Projection": rng.uniform(10, 55, n),
+        "Game": rng.choice(["GAMEA", "GAMEB", "GAMEC"], n),
+    })
+    cfg = Config()
+    solver = LineupSolver(
+        df_pool, cfg.min_salary, cfg.salary_cap, cfg.roster_size, cfg.min_games, use_dp=True
+    )
+    args = (solver.salary_units, solver.eligible, solver.min_units, solver.cap_units)
+    workspace = dp_workspace(n, solver.eligible.shape[1], solver.cap_units)
+
+    for sp in rng.uniform(10, 55, (6, n)):
+        assert select_lineup_dp(sp, *args, workspace) == select_lineup_dp(sp, *args)
+
+
+def test_dp_is_opt_in_and_skipped_past_its_memory_cap(monkeypatch):
+    """HiGHS is the default solver; an opted-in DP whose workspace would
+    exceed the cap is not used, and none is allocated."""
+    df_pool = _build_pool()
+    cfg = Config()
+    args = (df_pool, cfg.min_salary, cfg.salary_cap, cfg.roster_size, cfg.min_games)
+
+    assert not LineupSolver(*args).use_dp
+    monkeypatch.setattr(engine, "_DP_MAX_WORKSPACE_BYTES", 1)
+    solver = LineupSolver(*args, use_dp=True)
+    assert not solver.use_dp
+    assert solver.solve(0.0)[0] is not None
+    assert solver.dp_workspace is None
+
+
+def test_slot_lineup_by_time_puts_late_players_in_flex_slots():
+    """Later-starting players land in the flex slots (G, F, UTIL) so they stay
+    swappable, and every player sits in a slot they are eligible for."""
+    df_pool = _build_pool().iloc[:8].copy()
+    early, late = pd.Timestamp("2026-03-25 19:00"), pd.Timestamp("2026-03-25 22:00")
+    df_pool["StartTime"] = [early] * 5 + [late] * 3
+
+    slotted = slot_lineup_by_time(df_pool["Name + ID"].tolist(), df_pool)
+
+    assert dict(zip(ROSTER_SLOTS, slotted)) == {
+        "PG": "PG1 (1)",
+        "SG": "SG1 (2)",
+        "SF": "SF1 (3)",
+        "PF": "PF1 (4)",
+        "C": "C1 (5)",
+        "G": "G1 (6)",
+        "F": "F1 (7)",
+        "UTIL": "U1 (8)",
+    }
+    # Reusing a pool-wide eligibility matrix gives the same placement.
+    eligible = slot_eligibility_matrix(df_pool["Roster Position"])
+    assert slot_lineup_by_time(df_pool["Name + ID"].tolist(), df_pool, eligible) == slotted
+
+
+def test_min_games_above_two_uses_general_floor():
+    """A floor above DraftKings' two-game rule is still enforced exactly.
+
+    The base pool's optimum spans two games; adding a lower-projection GAMEC
+    center means min_games=3 can only be met by giving up projection for it.
+    """
+    df_pool = _build_pool()
+    extra = pd.DataFrame(
+        [("C3 (11)", 6200, "C", 30, "GAMEC")],
+        columns=["Name + ID", "Salary", "Roster Position", "Projection", "Game"],
+    )
+    df_pool = pd.concat([df_pool, extra], ignore_index=True)
+    cfg = Config()
+
+    lineup_names, selected_indices = generate_single_lineup(
+        df_pool,
+        randomness=0.0,
+        min_salary=cfg.min_salary,
+        salary_cap=cfg.salary_cap,
+        roster_size=cfg.roster_size,
+        min_games=3,
+    )
+
+    assert lineup_names is not None, "expected a feasible three-game lineup"
+    df_selected = df_pool.loc[list(selected_indices)]
+    assert df_selected["Game"].nunique() >= 3
+
+
+def test_filter_unique_lineups_enforces_min_unique_overlap():
+    """A candidate sharing more than roster_size - min_unique players with an
+    already-kept lineup is rejected; one that differs enough is kept."""
+    df_pool = _build_pool()
+    first = ([f"p{i}" for i in range(8)], set(range(8)))
+    one_swap = ([f"p{i}" for i in range(7)] + ["p8"], set(range(7)) | {8})
+    two_swaps = ([f"p{i}" for i in range(6)] + ["p8", "p9"], set(range(6)) | {8, 9})
+
+    kept, rejected = filter_unique_lineups(
+        [first, one_swap, first, two_swaps], df_pool.index, max_overlap=6, limit=10
+    )
+
+    assert kept == [first[0], two_swaps[0]]
+    assert rejected == 2
+
+    # min_unique=0 allows exact repeats.
+    kept, rejected = filter_unique_lineups(
+        [first, first], df_pool.index, max_overlap=8, limit=10
+    )
+    assert kept == [first[0], first[0]]
+    assert rejected == 0
@@ -18,10 +18,16 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from nba_optimizer import engine, late_swapper
 from nba_optimizer.config import Config, ROSTER_SLOTS
-from nba_optimizer.utils import derive_game_key, extract_player_id, is_player_locked
+from nba_optimizer.utils import (
+    derive_game_key,
+    extract_player_id,
+    is_player_locked,
+    locked_flags,
+)
 
 FIXTURES = Path(__file__).parent / "fixtures"
 SWAPPABLE_ENTRIES = FIXTURES / "swappable-DKEntries.csv"
@@ -34,43 +40,47 @@ BAM = "42398223"           # locked, matchup intact (MIA@CLE - contest locked, g
 WEMBY = "42398188"         # not locked, future game (SAS vs MEM)
 
 
-# --- derive_game_key: the in-progress resolution unit ---
-
-
-def test_derive_game_key_is_order_independent():
-    """Both sides of a matchup collapse to the same canonical key."""
-    assert derive_game_key("LAL", "IND", "In Progress") == "IND@LAL"
-    assert derive_game_key("IND", "LAL", "In Progress") == "IND@LAL"
-
+@pytest.fixture(scope="module")
+def swappable_pool():
+    """The swappable fixture's merged pool, loaded once for this module.
 
-def test_derive_game_key_falls_back_to_game_info():
-    """With no team/opponent, parse the matchup out of Game Info."""
-    assert (
-        derive_game_key(np.nan, np.nan, "SAS@MEM 03/25/2026 08:00PM ET") == "MEM@SAS"
-    )
-
-
-def test_derive_game_key_last_resort_is_team_alone():
-    """An in-progress player missing from projections still yields its team."""
-    assert derive_game_key("LAL", np.nan, "In Progress") == "LAL"
+    Tests only read it; copy it first before mutating.
+    """
+    return late_swapper.load_data(str(PROJS_SAMPLE), str(SWAPPABLE_ENTRIES))
 
 
-def test_derive_game_key_handles_all_missing():
-    """All-NaN inputs return an empty key rather than the string 'nan'."""
-    assert derive_game_key(np.nan, np.nan, np.nan) == ""
+# --- derive_game_key: the in-progress resolution unit ---
 
 
-def test_derive_game_key_opponent_fallback():
-    """With only the opponent known, prefer it over the Game Info split."""
-    assert derive_game_key(np.nan, "IND", "In Progress") == "IND"
+@pytest.mark.parametrize(
+    "team,opponent,game_info,expected",
+    [
+        # Both sides of a matchup collapse to the same canonical key.
+        ("LAL", "IND", "In Progress", "IND@LAL"),
+        ("IND", "LAL", "In Progress", "IND@LAL"),
+        # With no team/opponent, parse the matchup out of Game Info.
+        (np.nan, np.nan, "SAS@MEM 03/25/2026 08:00PM ET", "MEM@SAS"),
+        # An in-progress player missing from projections still yields its team.
+        ("LAL", np.nan, "In Progress", "LAL"),
+        # All-NaN inputs return an empty key rather than the string 'nan'.
+        (np.nan, np.nan, np.nan, ""),
+        # With only the opponent known, prefer it over the Game Info split.
+        (np.nan, "IND", "In Progress", "IND"),
+    ],
+    ids=[
+        "order-independent", "order-independent-reversed", "game-info-fallback",
+        "team-alone", "all-missing", "opponent-fallback",
+    ],
+)
+def test_derive_game_key(team, opponent, game_info, expected):
+    assert derive_game_key(team, opponent, game_info) == expected
 
 
 # --- real-fixture parsing: locks and game identity ---
 
 
-def test_load_data_detects_locks_in_pool_and_resolves_in_progress_games():
-    df_pool = late_swapper.load_data(str(PROJS_SAMPLE), str(SWAPPABLE_ENTRIES))
-    by_id = df_pool.set_index("ID")
+def test_load_data_detects_locks_in_pool_and_resolves_in_progress_games(swappable_pool):
+    by_id = swappable_pool.set_index("ID")
 
     # (LOCKED) is carried in the pool's own "Name + ID", not only the entries.
     assert is_player_locked(by_id.loc[LUKA, "Name + ID"])
@@ -88,6 +98,18 @@ def test_load_data_detects_locks_in_pool_and_resolves_in_progress_games():
     assert by_id.loc[LUKA, "Game"] != by_id.loc[BAM, "Game"]
 
 
+def test_pool_time_scores_rank_in_progress_last_without_flattening_others(swappable_pool):
+    """In-progress players score as latest, while the parsed start times
+    still spread the remaining players across [0, 1]."""
+    _, time_scores = late_swapper.pool_swap_arrays(swappable_pool)
+    by_id = pd.Series(time_scores, index=swappable_pool["ID"])
+
+    assert by_id.loc[LUKA] == 1.0
+    # MIA@CLE (7:30PM) is the earliest tip of the unstarted games.
+    assert by_id.loc[BAM] == 0.0
+    assert 0.0 < by_id.loc[WEMBY] < 1.0
+
+
 # --- pre-lock (standard pipeline) entries parse cleanly ---
 
 
@@ -99,7 +121,7 @@ def test_unfilled_entries_parse_as_prelock_pool():
 
     assert len(df) > 0, "expected players parsed from the pre-lock pool"
     # Nothing is locked before any game starts.
-    assert not df["Name + ID"].apply(is_player_locked).any()
+    assert not locked_flags(df["Name + ID"]).any()
     # Game Info carries real matchups here (no "In Progress"), so engine's
     # split keys games by matchup.
     by_id = df.set_index("ID")
@@ -140,24 +162,6 @@ def _single_game_dominant_pool() -> pd.DataFrame:
     return df
 
 
-def test_solve_batch_enforces_min_games():
-    """With every slot open and no locks, the all-one-game optimum must be
-    rejected in favour of a >= min_games lineup."""
-    df_pool = _single_game_dominant_pool()
-    cfg = replace(Config(), min_salary=49000, salary_cap=50000, min_games=2)
-
-    # A non-locked 8-man template -> all slots are re-optimized from the pool.
-    template = [name for name in df_pool["Name + ID"].tolist()[:8]]
-
-    lineups = late_swapper.solve_late_swap_batch(df_pool, template, cfg, num_to_generate=1)
-
-    assert len(lineups) == 1
-    picked = [p for p in lineups[0] if p not in ("EMPTY", "ERROR")]
-    assert len(picked) == len(ROSTER_SLOTS)
-    games = {df_pool.set_index("Name + ID").loc[p, "Game"] for p in picked}
-    assert len(games) >= cfg.min_games
-
-
 def _mixed_game_pool() -> pd.DataFrame:
     """Pool where the locked player's game (GAMEA) also has draftable players.
 
@@ -192,32 +196,140 @@ def _mixed_game_pool() -> pd.DataFrame:
     return df
 
 
-def test_min_games_excludes_locked_game_from_floor():
-    """A locked game that still has draftable players must not satisfy the
-    min_games floor twice. The final lineup must span >= min_games real games
-    even when the projection-optimal open-slot fill stays in the locked game."""
+@pytest.mark.parametrize(
+    "make_pool,min_salary,template",
+    [
+        # Every slot open and no locks: the all-one-game optimum must be
+        # rejected in favour of a >= min_games lineup.
+        (_single_game_dominant_pool, 49000, ["PGa (1)", "SGa (2)", "SFa (3)", "PFa (4)",
+                                             "Ca (5)", "Ga (6)", "Fa (7)", "Ua (8)"]),
+        # PG is locked in GAMEA, which still has draftable players: the locked
+        # game must not satisfy the floor twice, even though the
+        # projection-optimal open-slot fill stays in it.
+        (_mixed_game_pool, 0, ["LkPG (100) (LOCKED)", "SGa (2)", "SFa (3)", "PFa (4)",
+                               "Ca (5)", "Ga (6)", "Fa (7)", "Ua (8)"]),
+    ],
+    ids=["no-locks", "locked-game-not-double-counted"],
+)
+def test_solve_batch_enforces_min_games(make_pool, min_salary, template):
+    df_pool = make_pool()
+    cfg = replace(Config(), min_salary=min_salary, salary_cap=50000, min_games=2)
+
+    lineups = late_swapper.solve_late_swap_batch(df_pool, template, cfg, num_to_generate=1)
+
+    assert len(lineups) == 1
+    picked = [p for p in lineups[0] if p not in ("EMPTY", "ERROR")]
+    assert len(picked) == len(ROSTER_SLOTS)
+    game_by_name = df_pool.set_index("Name + ID")["Game"].to_dict()
+    assert len({game_by_name[p] for p in picked}) >= cfg.min_games
+
+
+def test_fully_locked_lineup_is_returned_without_solving(monkeypatch):
+    """An entry with no unlocked slot comes back verbatim and never reaches
+    HiGHS."""
+    df_pool = _mixed_game_pool()
+    template = [
+        "LkPG (100) (LOCKED)", "SGa (2) (LOCKED)", "SFa (3) (LOCKED)",
+        "PFa (4) (LOCKED)", "Ca (5) (LOCKED)", "Ga (6) (LOCKED)",
+        "Fa (7) (LOCKED)", "Ua (8) (LOCKED)",
+    ]
+    solver = late_swapper.LateSwapSolver(df_pool, Config())
+    monkeypatch.setattr(solver.highs, "run", lambda: pytest.fail("HiGHS was called"))
+
+    assert solver.solve(template, num_to_generate=2) == [template, template]
+
+
+def test_single_open_slot_ranks_candidates_without_solver(monkeypatch):
+    """With one open slot, the batch is the feasible candidates in projection
+    order; the min_games floor still rules out the locked game's players."""
     df_pool = _mixed_game_pool()
     cfg = replace(Config(), min_salary=0, salary_cap=50000, min_games=2)
 
-    # PG is locked in GAMEA; the other seven slots are re-optimized.
+    # Everything but UTIL is locked in GAMEA, so UTIL must come from GAMEB.
     template = [
-        "LkPG (100) (LOCKED)", "SGa (2)", "SFa (3)", "PFa (4)",
-        "Ca (5)", "Ga (6)", "Fa (7)", "Ua (8)",
+        "LkPG (100) (LOCKED)", "SGa (2) (LOCKED)", "SFa (3) (LOCKED)",
+        "PFa (4) (LOCKED)", "Ca (5) (LOCKED)", "Ga (6) (LOCKED)",
+        "Fa (7) (LOCKED)", "Ua (8)",
     ]
+    solver = late_swapper.LateSwapSolver(df_pool, cfg)
+    monkeypatch.setattr(solver.highs, "run", lambda: pytest.fail("HiGHS was called"))
 
-    lineups = late_swapper.solve_late_swap_batch(df_pool, template, cfg, num_to_generate=1)
+    lineups = solver.solve(template, num_to_generate=3)
 
-    picked = [p for p in lineups[0] if p not in ("EMPTY", "ERROR")]
-    assert len(picked) == len(ROSTER_SLOTS)
-    game_by_name = df_pool.set_index("Name + ID")["Game"].to_dict()
-    games = {game_by_name[p] for p in picked}
-    assert len(games) >= cfg.min_games
+    assert len(lineups) == 3
+    assert all(lineup[:7] == template[:7] for lineup in lineups)
+    utils_picked = [lineup[7] for lineup in lineups]
+    assert set(utils_picked[:2]) == {"Ub (9)", "Gb (10)"}
+    assert utils_picked[2] == utils_picked[1]
+
+
+def test_unreachable_salary_floor_returns_entry_without_solver(monkeypatch):
+    """When even the dearest open-slot fill misses the salary floor, the entry
+    comes back unchanged and HiGHS is never run."""
+    df_pool = _mixed_game_pool()
+    cfg = replace(Config(), min_salary=50000, salary_cap=60000, min_games=1)
+    template = [
+        "LkPG (100) (LOCKED)", "SGa (2) (LOCKED)", "SFa (3) (LOCKED)",
+        "PFa (4) (LOCKED)", "Ca (5) (LOCKED)", "Ga (6) (LOCKED)",
+        "Fa (7)", "Ua (8)",
+    ]
+    solver = late_swapper.LateSwapSolver(df_pool, cfg)
+    monkeypatch.setattr(solver.highs, "run", lambda: pytest.fail("HiGHS was called"))
+
+    assert solver.solve(template, num_to_generate=2) == [template, template]
+
+
+def test_entry_player_arrays_match_per_cell_helpers():
+    """The vectorized pass agrees with extract_player_id/is_player_locked."""
+    cells = np.array(
+        [
+            ["Luka Doncic (42062851) (LOCKED)", "Bam Adebayo (42062900)"],
+            ["Wemby (42063000) (locked)", None],
+        ],
+        dtype=object,
+    )
+
+    ids, marked = late_swapper.entry_player_arrays(cells)
+
+    for cell, pid, is_marked in zip(cells.ravel(), ids.ravel(), marked.ravel()):
+        assert pid == extract_player_id(cell)
+        assert is_marked == is_player_locked(cell)
+
+
+def test_solver_builds_columns_only_for_draftable_players():
+    """Pool-locked players never become model columns, and the model has one
+    column per remaining player rather than per (player, slot) pair."""
+    df_pool = _mixed_game_pool()
+    solver = late_swapper.LateSwapSolver(df_pool, Config())
+
+    eligible, _ = late_swapper.pool_swap_arrays(df_pool)
+    unlocked = ~df_pool["Name + ID"].str.contains("(LOCKED)", regex=False).to_numpy()
+    assert solver.n_players == unlocked.sum()
+    assert solver.highs.getNumCol() == solver.n_players
+    assert (solver.eligible == eligible[unlocked]).all()
+
+
+def test_reused_solver_matches_fresh_solves():
+    """A LateSwapSolver reused across base states returns what a freshly
+    built model would; each base state's rows are removed afterwards."""
+    df_pool = _mixed_game_pool()
+    cfg = replace(Config(), min_salary=0, salary_cap=50000, min_games=2)
+    base = ["LkPG (100) (LOCKED)", "SGa (2)", "SFa (3)", "PFa (4)",
+            "Ca (5)", "Ga (6)", "Fa (7)", "Ua (8)"]
+    templates = [base, base[:1] + ["SGa (2) (LOCKED)", "SFa (3) (LOCKED)"] + base[3:], base]
+
+    solver = late_swapper.LateSwapSolver(df_pool, cfg)
+    for template in templates:
+        reused = solver.solve(template, num_to_generate=2)
+        fresh = late_swapper.solve_late_swap_batch(df_pool, template, cfg, num_to_generate=2)
+        assert [set(lineup) for lineup in reused] == [set(lineup) for lineup in fresh]
+        assert solver.highs.getNumRow() == solver.n_base_rows
 
 
 # --- end-to-end on real fixtures: locks preserved, min_games satisfied ---
 
 
-def test_run_preserves_locks_and_min_games(tmp_path):
+def test_run_preserves_locks_and_min_games(tmp_path, swappable_pool):
     projs_dir = tmp_path / "projections"
     projs_dir.mkdir()
     # run() locates projections via the NBA-Projs-*.csv glob.
@@ -251,11 +363,12 @@ def test_run_preserves_locks_and_min_games(tmp_path):
     }
 
     # Pool IDs that are locked (per the pool's own Name + ID tag).
-    df_pool = late_swapper.load_data(str(PROJS_SAMPLE), str(SWAPPABLE_ENTRIES))
+    # Computed with plain string ops so a bug in the ID/lock helpers that
+    # late_swapper.run uses cannot also hide in this expected value.
     locked_pool_ids = {
-        extract_player_id(n)
-        for n in df_pool["Name + ID"]
-        if is_player_locked(n)
+        n.split("(")[1].split(")")[0]
+        for n in swappable_pool["Name + ID"]
+        if "(LOCKED)" in n.upper()
     }
 
     in_by_entry = {r["Entry ID"]: r for _, r in df_in.iterrows() if pd.notna(r.get("Entry ID"))}
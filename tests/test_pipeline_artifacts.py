@@ -152,7 +152,7 @@ class TestRankerExplicitLineupFile:
         # Write DKEntries for the engine.load_data call inside ranker
         _build_dkentries_csv(cfg.entries_path)
 
-        result = ranker.run(
+        result, _ = ranker.run(
             cfg,
             lineup_file=lineup_pool_path,
             projs_file=projs_path,
@@ -189,7 +189,7 @@ class TestRankerExplicitLineupFile:
         _build_projs_csv(projs_path)
         _build_dkentries_csv(cfg.entries_path)
 
-        result = ranker.run(cfg, lineup_file=explicit_path, projs_file=projs_path)
+        result, _ = ranker.run(cfg, lineup_file=explicit_path, projs_file=projs_path)
         assert result and os.path.isfile(result)
 
         # 2 rows means the explicit (older) file was used, not the stale newest file.
@@ -197,6 +197,23 @@ class TestRankerExplicitLineupFile:
         assert len(df_out) == 2
 
 
+    def test_ranks_in_memory_lineups_and_returns_written_frame(self, tmp_path):
+        """A lineup pool passed as a frame is ranked without a lineup file, and
+        the returned frame matches the CSV that was written."""
+        from nba_optimizer import ranker
+
+        cfg = _make_config(tmp_path)
+        projs_path = str(tmp_path / "projections" / "NBA-Projs-2026-01-01.csv")
+        _build_projs_csv(projs_path)
+        _build_dkentries_csv(cfg.entries_path)
+        df_lineups = pd.DataFrame([_LINEUP, _LINEUP], columns=list(ROSTER_SLOTS))
+
+        result, df_ranked = ranker.run(cfg, projs_file=projs_path, df_lineups=df_lineups)
+
+        assert result and os.path.isfile(result)
+        pd.testing.assert_frame_equal(df_ranked, pd.read_csv(result), check_dtype=False)
+
+
 class TestExporterExplicitRankedFile:
     """exporter.run() honours an explicit ranked_file."""
 
@@ -252,6 +269,23 @@ class TestExporterExplicitRankedFile:
         assert df_out.loc[filled, ROSTER_SLOTS[0]].notna().any()
 
 
+    def test_exports_in_memory_ranked_lineups(self, tmp_path):
+        """Ranked lineups passed as a frame are exported without a ranked file."""
+        from nba_optimizer import exporter
+
+        cfg = _make_config(tmp_path)
+        os.makedirs(cfg.output_dir, exist_ok=True)
+        _build_dkentries_csv(cfg.entries_path)
+        df_ranked = pd.DataFrame([_LINEUP], columns=list(ROSTER_SLOTS))
+
+        result = exporter.run(cfg, df_ranked=df_ranked)
+        assert result and os.path.isfile(result)
+
+        df_out = pd.read_csv(result)
+        filled = df_out["Entry ID"].notna()
+        assert df_out.loc[filled, ROSTER_SLOTS[0]].iloc[0] == _LINEUP[0]
+
+
 class TestExposureReportResolveEntriesFile:
     """exposure_report._resolve_entries_file() still honours explicit entries_file."""
 
@@ -0,0 +1,66 @@
+"""Tests for lineup scoring and ranking in nba_optimizer.ranker."""
+
+import math
+
+import pandas as pd
+import pytest
+
+from nba_optimizer.config import ROSTER_SLOTS
+from nba_optimizer.ranker import rank_lineups
+
+
+def _players() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Name + ID": [f"P{i} ({i})" for i in range(10)],
+        "Projection": [float(30 + i) for i in range(10)],
+        "Own_Proj": [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 14.0, 16.0, 18.0],
+    })
+
+
+def test_rank_lineups_scores_match_per_lineup_sums():
+    """Vectorized totals and geomean equal the per-lineup arithmetic; a name
+    missing from the pool contributes 0 projection and floored ownership."""
+    players = _players()
+    lineups = pd.DataFrame(
+        [
+            [f"P{i} ({i})" for i in range(8)],
+            [f"P{i} ({i})" for i in range(2, 10)],
+            [f"P{i} ({i})" for i in range(1, 8)] + ["Nobody (99)"],
+        ],
+        columns=ROSTER_SLOTS,
+    )
+    proj = dict(zip(players["Name + ID"], players["Projection"]))
+    own = dict(zip(players["Name + ID"], players["Own_Proj"]))
+
+    ranked = rank_lineups(lineups, players, {"proj": 1.0, "own": 0.0, "geo": 0.0})
+    ranked = ranked.set_index("Lineup_ID").sort_index()
+
+    for lineup_id, row in lineups.iterrows():
+        names = list(row)
+        got = ranked.loc[lineup_id + 1]
+        assert got["Total_Projection"] == pytest.approx(sum(proj.get(n, 0) for n in names))
+        assert got["Total_Ownership"] == pytest.approx(sum(own.get(n, 0) for n in names))
+        geo = math.exp(sum(math.log(max(0.1, own.get(n, 0))) for n in names) / 8)
+        assert got["Geomean_Ownership"] == pytest.approx(geo)
+        assert list(got[list(ROSTER_SLOTS)]) == names
+
+    # Projection-only weights rank the highest-projected lineup first.
+    assert list(ranked.sort_values("Final_Rank").index) == [2, 1, 3]
+
+
+def test_rank_lineups_floors_blank_ownership_in_geomean():
+    """A blank Own_Proj counts as the 0.1 floor in the geomean rather than
+    turning the lineup's Geomean_Ownership and Geo_Rank into NaN."""
+    players = _players()
+    players.loc[0, "Own_Proj"] = float("nan")
+    lineups = pd.DataFrame(
+        [[f"P{i} ({i})" for i in range(8)], [f"P{i} ({i})" for i in range(2, 10)]],
+        columns=ROSTER_SLOTS,
+    )
+
+    ranked = rank_lineups(lineups, players, {"proj": 0.0, "own": 0.0, "geo": 1.0})
+    got = ranked.set_index("Lineup_ID").loc[1]
+
+    floored = [0.1] + list(players["Own_Proj"].iloc[1:8])
+    assert got["Geomean_Ownership"] == pytest.approx(math.exp(sum(map(math.log, floored)) / 8))
+    assert ranked["Geo_Rank"].notna().all()
@@ -13,17 +13,32 @@ from datetime import datetime
 import pandas as pd
 import pytest
 
+from nba_optimizer import utils
+from nba_optimizer.config import ROSTER_SLOTS
 from nba_optimizer.utils import (
     extract_player_id,
+    get_latest_file,
     merge_player_pool,
     parse_dk_entries,
     parse_game_time,
+    parse_game_times,
     read_ragged_csv,
+    slot_eligibility_matrix,
 )
 
 FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
 
 
+def test_get_latest_file_reports_no_match_for_missing_or_file_paths(tmp_path):
+    """A directory that is missing, or is actually a file, raises the same
+    'No files matching' error as a directory with no matches."""
+    not_a_dir = tmp_path / "DKEntries.csv"
+    not_a_dir.write_text("x\n")
+    for directory in (tmp_path, tmp_path / "missing", not_a_dir):
+        with pytest.raises(FileNotFoundError, match="No files matching"):
+            get_latest_file(str(directory), "NBA-Projs-*.csv")
+
+
 def test_extract_player_id_from_name_and_id_string():
     """A normal 'Name (ID)' string yields the numeric ID."""
     assert extract_player_id("LeBron James (12345)") == "12345"
@@ -51,6 +66,17 @@ def test_parse_game_time_invalid_falls_back_to_max():
     assert parse_game_time("not a real game info string") == datetime.max
 
 
+def test_parse_game_times_matches_scalar_parser_and_marks_bad_rows_nat():
+    """The vectorized parser agrees with parse_game_time on valid strings and
+    yields NaT (rather than datetime.max) for unparseable ones."""
+    game_info = pd.Series(["MIA@PHI 02/25/2026 07:00PM ET", "In Progress", None])
+
+    result = parse_game_times(game_info)
+
+    assert result.iloc[0] == parse_game_time(game_info.iloc[0])
+    assert result.iloc[1:].isna().all()
+
+
 def test_read_ragged_csv_preserves_valid_columns_and_pads_ragged_rows():
     """read_ragged_csv keeps the real header columns and pads short/long rows."""
     csv_path = os.path.join(FIXTURES_DIR, "ragged_sample.csv")
@@ -114,6 +140,56 @@ def test_parse_dk_entries_finds_player_pool_section(dk_entries_file):
     assert "Name + ID" in df.columns
 
 
+def test_parse_dk_entries_reuses_parse_until_file_changes(dk_entries_file):
+    """Repeat reads return independent copies and pick up edits to the file."""
+    first = parse_dk_entries(dk_entries_file)
+    first.loc[:, "ID"] = "mutated"
+    assert list(parse_dk_entries(dk_entries_file)["ID"]) == ["1", "2"]
+
+    with open(dk_entries_file, "a", encoding="utf-8") as f:
+        f.write("C,Cy (3),Cy,3,C,4000,AAA@BBB 01/01/2026 07:00PM ET\n")
+    assert list(parse_dk_entries(dk_entries_file)["ID"]) == ["1", "2", "3"]
+
+
+def test_clear_file_caches_forces_a_fresh_parse(dk_entries_file, monkeypatch):
+    """The parse cache is bounded, and clearing it sends the next load to disk."""
+    assert utils._parse_once.cache_info().maxsize is not None
+    parse_dk_entries(dk_entries_file)
+    utils.clear_file_caches()
+
+    monkeypatch.setattr(utils.pd, "read_csv", lambda *a, **k: pytest.fail("re-parsed"))
+    with pytest.raises(pytest.fail.Exception, match="re-parsed"):
+        parse_dk_entries(dk_entries_file)
+
+
+def test_entries_text_read_once_feeds_both_parsers(dk_entries_file, monkeypatch):
+    """Text passed in from one read_text call is parsed by both readers
+    without reopening the file, and matches what a fresh read returns."""
+    expected_entries, expected_cols = read_ragged_csv(dk_entries_file)
+    expected_pool = parse_dk_entries(dk_entries_file)
+    text = utils.read_text(dk_entries_file)
+
+    monkeypatch.setattr(utils, "open", lambda *a, **k: pytest.fail("reopened"), raising=False)
+    entries, cols = read_ragged_csv(dk_entries_file, text=text)
+    pool = parse_dk_entries(dk_entries_file, text)
+
+    assert cols == expected_cols
+    pd.testing.assert_frame_equal(entries, expected_entries)
+    pd.testing.assert_frame_equal(pool, expected_pool)
+
+
+def test_read_ragged_csv_pads_past_max_columns(tmp_path):
+    """A line wider than max_columns is padded to, not rejected or dropped."""
+    path = tmp_path / "wide.csv"
+    path.write_text("Entry ID,Contest Name\n1,Main\n2," + ",".join(["x"] * 30) + "\n")
+
+    df, valid_cols = read_ragged_csv(str(path), max_columns=5)
+
+    assert valid_cols == ["Entry ID", "Contest Name"]
+    assert list(df["Entry ID"]) == ["1", "2"]
+    assert df.shape == (2, 31)
+
+
 def test_parse_dk_entries_raises_on_missing_sentinel(tmp_path):
     """parse_dk_entries raises ValueError when no player-pool header is found."""
     bad = tmp_path / "bad.csv"
@@ -257,3 +333,17 @@ def test_merge_player_pool_normalizes_float_projs_ids(dk_entries_file):
     df = merge_player_pool(df_players, df_projs_float, how="inner")
     assert len(df) == 1, "float ID in projs should still match after normalization"
     assert df.iloc[0]["Projection"] == 42.0
+
+
+def test_slot_eligibility_matrix_follows_dk_flex_rules():
+    """Each row marks the DK slots a player can fill, in ROSTER_SLOTS order:
+    G takes PG/SG, F takes SF/PF, and UTIL takes everyone."""
+    positions = pd.Series(["PG/G/UTIL", "SF/PF/F/UTIL", "C/UTIL"])
+
+    eligible = slot_eligibility_matrix(positions)
+
+    assert eligible.shape == (3, len(ROSTER_SLOTS))
+    by_slot = [dict(zip(ROSTER_SLOTS, row)) for row in eligible]
+    assert [s for s, ok in by_slot[0].items() if ok] == ["PG", "G", "UTIL"]
+    assert [s for s, ok in by_slot[1].items() if ok] == ["SF", "PF", "F", "UTIL"]
+    assert [s for s, ok in by_slot[2].items() if ok] == ["C", "UTIL"]